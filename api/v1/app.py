@@ -1,22 +1,212 @@
 #!/usr/bin/python3
 # api/v1/app.py
 """Create the instance of the Flask"""
+from hashlib import sha1
 import os
-from flask import Flask, make_response, jsonify
+from flask import Flask, g, make_response, jsonify, request
 from flask_cors import CORS
 from models import storage
+from api.v1.cache import MAX_ENTRY_BYTES, ResponseCache
 from api.v1.views import app_views
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "0.0.0.0"}})
 app.register_blueprint(app_views)
 
+# cached GET views by endpoint: (time to live in seconds, classes whose
+# changes invalidate the response, {view argument: class of the object
+# whose id it is}); the file storage clears the cache once it reads files
+# another process changed, but changes to the database are only seen
+# through this process' storage, so the time to live bounds how long other
+# writers can go unnoticed
+CACHED_VIEWS = {
+    "app_views.stats": (60, ("Amenity", "City", "Place", "Review", "State",
+                             "User"), {}),
+    "app_views.get_states": (300, ("State",), {}),
+    "app_views.get_state": (300, (), {"state_id": "State"}),
+    "app_views.get_cities": (300, ("City",), {"state_id": "State"}),
+    "app_views.get_city": (300, (), {"city_id": "City"}),
+    "app_views.get_amenities": (300, ("Amenity",), {}),
+    "app_views.get_amenity": (300, (), {"amenity_id": "Amenity"}),
+    "app_views.get_users": (300, ("User",), {}),
+    "app_views.get_user": (300, (), {"user_id": "User"}),
+    "app_views.get_places": (300, ("Place",), {"city_id": "City"}),
+    "app_views.get_place": (300, (), {"place_id": "Place"}),
+    "app_views.get_reviews": (300, ("Review",), {"place_id": "Place"}),
+    "app_views.get_review": (300, (), {"review_id": "Review"}),
+    "app_views.places_amenities": (300, ("Amenity",), {"place_id": "Place"}),
+    "app_views.search": (60, ("Place", "Review"), {}),
+}
+# views answering conditional GETs by endpoint, the ETag of a list being
+# derived from storage.version() of these classes
+COLLECTION_ETAGS = {
+    "app_views.stats": ("Amenity", "City", "Place", "Review", "State",
+                        "User"),
+    "app_views.get_states": ("State",),
+    "app_views.get_cities": ("City", "State"),
+    "app_views.get_amenities": ("Amenity",),
+    "app_views.get_users": ("User",),
+    "app_views.get_places": ("Place", "City"),
+    "app_views.get_reviews": ("Review", "Place"),
+}
+# and the ETag of an object from its id and updated_at, by endpoint:
+# (view argument, class of the object whose id it is)
+OBJECT_ETAGS = {
+    "app_views.get_state": ("state_id", "State"),
+    "app_views.get_city": ("city_id", "City"),
+    "app_views.get_amenity": ("amenity_id", "Amenity"),
+    "app_views.get_user": ("user_id", "User"),
+    "app_views.get_place": ("place_id", "Place"),
+    "app_views.get_review": ("review_id", "Review"),
+}
+cache = None
+if os.getenv('HBNB_API_CACHE', '1') != '0':
+    cache = ResponseCache(int(os.getenv('HBNB_API_CACHE_SIZE', 1024)))
+    storage.listen(cache.invalidate)
+
 
 @app.teardown_appcontext
 def teardown(exception):
+    """closes the storage once per request: the context of a streamed
+    response is torn down before its body is sent, then again after"""
+    if g.pop('streaming', False):
+        return
     storage.close()
 
 
+def current_etag():
+    """returns the ETag of the response to the current GET request, None
+    if its view has none; the object of an OBJECT_ETAGS view is kept in
+    g.etag_object for the view"""
+    if request.endpoint in OBJECT_ETAGS:
+        arg, name = OBJECT_ETAGS[request.endpoint]
+        obj = g.get('etag_object')
+        if obj is None:
+            obj = storage.get(name, request.view_args[arg])
+        if obj is None:
+            return None
+        g.etag_object = obj
+        tag = "{}.{}|{}".format(name, obj.id, obj.updated_at.isoformat())
+    elif request.endpoint in COLLECTION_ETAGS:
+        versions = [storage.version(name)
+                    for name in COLLECTION_ETAGS[request.endpoint]]
+        tag = repr((versions, request.full_path,
+                    request.headers.get('Accept', '')))
+    else:
+        return None
+    return sha1(tag.encode()).hexdigest()
+
+
+@app.before_request
+def conditional_get():
+    """answers 304 to a GET whose If-None-Match has the ETag of the
+    response, which is computed without serializing anything"""
+    if request.method != 'GET' or not request.if_none_match:
+        return None
+    g.etag = current_etag()
+    if g.etag is not None and request.if_none_match.contains(g.etag):
+        response = app.response_class(status=304)
+        response.set_etag(g.etag)
+        return response
+    return None
+
+
+def cache_key():
+    """returns the key of the response to the current request"""
+    return (request.path, tuple(sorted(request.args.items(multi=True))),
+            request.headers.get('Accept', ''))
+
+
+@app.before_request
+def cached_response():
+    """serves a GET request of a cached view from the cache"""
+    if cache is None or request.method != 'GET' or \
+       request.endpoint not in CACHED_VIEWS:
+        return None
+    g.cache_generation = cache.generation()
+    entry = cache.get(cache_key())
+    if entry is None:
+        return None
+    g.cache_hit = True
+    body, status, headers = entry
+    return app.response_class(body, status, headers)
+
+
+@app.after_request
+def cache_response(response):
+    """caches the response of a cached view, once its body is sent if it
+    is streamed"""
+    if cache is None or request.method != 'GET' or \
+       request.endpoint not in CACHED_VIEWS or \
+       'cache_generation' not in g or g.get('cache_hit') or \
+       response.status_code != 200:
+        return response
+    ttl, classes, objects = CACHED_VIEWS[request.endpoint]
+    dependencies = list(classes)
+    for arg, value in (request.view_args or {}).items():
+        if arg in objects:
+            dependencies.append(objects[arg] + "." + value)
+    key = cache_key()
+    generation = g.cache_generation
+    status = response.status_code
+    headers = [(name, value) for name, value in response.headers
+               if name != 'Content-Length']
+
+    def store(body):
+        """caches the body of the response"""
+        cache.put(key, (body, status, headers), ttl, dependencies,
+                  generation)
+
+    if not response.is_streamed:
+        body = response.get_data()
+        if len(body) <= MAX_ENTRY_BYTES:
+            store(body)
+        return response
+    response.response = tee(response.response, store)
+    return response
+
+
+@app.after_request
+def set_etag(response):
+    """sets the ETag of a GET response, before cache_response() caches it
+    with the response"""
+    if request.method == 'GET' and response.status_code == 200 and \
+       not g.get('cache_hit'):
+        tag = g.get('etag') or current_etag()
+        if tag is not None:
+            response.set_etag(tag)
+    return response
+
+
+def tee(chunks, store):
+    """
+    Yields the chunks of a streamed body, then stores the whole body if it
+    is no larger than MAX_ENTRY_BYTES
+
+    Args:
+        chunks (iterable): the chunks, bytes or strings
+        store (function): called with the body, as bytes
+    """
+    body = []
+    size = 0
+    try:
+        for chunk in chunks:
+            if body is not None:
+                data = chunk.encode() if isinstance(chunk, str) else chunk
+                size += len(data)
+                if size <= MAX_ENTRY_BYTES:
+                    body.append(data)
+                else:
+                    body = None
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+    if body is not None:
+        store(b"".join(body))
+
+
 @app.errorhandler(404)
 def not_found(error):
     return make_response(jsonify({"error": "Not found"}), 404)
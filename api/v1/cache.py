@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+# api/v1/cache.py
+"""Bounded LRU cache of API responses, invalidated by storage changes"""
+from collections import OrderedDict
+import threading
+import time
+
+# largest response body kept in the cache, in bytes
+MAX_ENTRY_BYTES = 1 << 20
+
+
+class ResponseCache:
+    """
+    LRU cache of response bodies with a time to live
+
+    Each entry depends on classes ("State") and objects ("State.<id>").
+    invalidate() drops the entries depending on a changed object or on its
+    class, or every entry when anything may have changed. Every method can
+    be called from several threads.
+    """
+
+    def __init__(self, size):
+        """
+        Instantiate an empty ResponseCache
+
+        Args:
+            size (int): maximum number of entries
+        """
+        self.__size = size
+        self.__lock = threading.Lock()
+        # OrderedDict - (expiry time, dependencies, value) by key, least
+        # recently used first
+        self.__entries = OrderedDict()
+        # dictionary - sets of keys by dependency
+        self.__dependents = {}
+        # int - number of invalidations so far
+        self.__generation = 0
+
+    def generation(self):
+        """returns a token to give put() for a value computed from now on"""
+        return self.__generation
+
+    def get(self, key):
+        """returns the value cached under key, None if missing or expired"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self.__drop(key)
+                return None
+            self.__entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, value, ttl, dependencies, generation):
+        """
+        Caches a value, unless something was invalidated since it was
+        computed
+
+        Args:
+            key: key of the entry
+            value: the cached value
+            ttl (float): number of seconds the entry is valid for
+            dependencies (iterable): class names and <class name>.id keys
+                whose changes drop the entry
+            generation (int): generation() before the value was computed
+        """
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            self.__drop(key)
+            dependencies = frozenset(dependencies)
+            self.__entries[key] = (time.monotonic() + ttl, dependencies,
+                                   value)
+            for dependency in dependencies:
+                self.__dependents.setdefault(dependency, set()).add(key)
+            while len(self.__entries) > self.__size:
+                self.__drop(next(iter(self.__entries)))
+
+    def invalidate(self, key):
+        """drops the entries depending on the object <class name>.id key
+        or on its class, every entry if key is None"""
+        if key is None:
+            self.clear()
+            return
+        with self.__lock:
+            self.__generation += 1
+            for dependency in (key.partition(".")[0], key):
+                for dependent in self.__dependents.pop(dependency, ()):
+                    self.__drop(dependent)
+
+    def clear(self):
+        """drops every entry"""
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+            self.__dependents.clear()
+
+    def __len__(self):
+        """returns the number of entries"""
+        return len(self.__entries)
+
+    def __drop(self, key):
+        """removes an entry and its dependencies, the lock being held"""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        for dependency in entry[1]:
+            dependents = self.__dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self.__dependents[dependency]
@@ -1,10 +1,11 @@
 #!/usr/bin/python3
 # api/v1/views/amenities.py
 """Handles all default RESTFul API actions for Amenities"""
-from flask import jsonify, abort, request
+from flask import jsonify, abort, g, request
 from models.amenity import Amenity
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
@@ -13,10 +14,10 @@ def get_amenities():
     Retrieves a list of all the Amenity objects
 
     Returns:
-        A list of all Amenity objects
+        A list of all Amenity objects, one page at a time if `limit` or
+        `cursor` is given
     """
-    amenities = storage.all(Amenity).values()
-    return jsonify([amenity.to_dict() for amenity in amenities])
+    return paginate(Amenity)
 
 
 @app_views.route(
@@ -34,9 +35,10 @@ def get_amenity(amenity_id):
     Returns:
         An Amenity object, otherwise 404 error
     """
-    amenity = storage.get(Amenity, amenity_id)
+    amenity = g.get('etag_object') or storage.get(Amenity, amenity_id)
     if amenity is None:
         abort(404)
+    g.etag_object = amenity
     return jsonify(amenity.to_dict())
 
 
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+# api/v1/views/bulk.py
+"""Handles the bulk creation of objects"""
+from flask import abort, request
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from models import storage
+from api.v1.views import app_views
+from api.v1.views.pagination import stream
+
+# largest number of objects created by a request
+MAX_BULK = 10000
+# by resource: (class, attributes every object must have, {attribute:
+# class of the object whose id it is})
+BULK_RESOURCES = {
+    "states": (State, ("name",), {}),
+    "amenities": (Amenity, ("name",), {}),
+    "users": (User, ("email", "password"), {}),
+    "cities": (City, ("state_id", "name"), {"state_id": State}),
+    "places": (Place, ("city_id", "user_id", "name"),
+               {"city_id": City, "user_id": User}),
+    "reviews": (Review, ("place_id", "user_id", "text"),
+                {"place_id": Place, "user_id": User}),
+}
+
+
+@app_views.route('/<any(states, amenities, users, cities, places, reviews)'
+                 ':resource>/bulk', methods=['POST'], strict_slashes=False)
+def create_bulk(resource):
+    """
+    Creates many objects of a resource with a single storage write
+
+    The body is a JSON array of at most MAX_BULK objects, each with the
+    attributes the single creation needs; the parent ids given in the URL
+    of a single creation (e.g. state_id for a City) are attributes here.
+    Nothing is created unless every object is valid; an object may give
+    its id, which must be a string no other object has.
+
+    Returns:
+        The new objects with code 201, otherwise error code 404 or 400
+    """
+    cls, required, parents = BULK_RESOURCES[resource]
+    data = request.get_json(silent=True)
+    if not isinstance(data, list) or \
+       not all(isinstance(item, dict) for item in data):
+        abort(400, "Not a JSON array of objects")
+    if len(data) > MAX_BULK:
+        abort(400, "More than {} objects".format(MAX_BULK))
+    for i, item in enumerate(data):
+        for attr in required:
+            if attr not in item:
+                abort(400, "Missing {} in object {}".format(attr, i))
+    ids = [item["id"] for item in data if "id" in item]
+    for id in ids:
+        if not isinstance(id, str):
+            abort(400, "Invalid id")
+    if len(set(ids)) != len(ids):
+        abort(400, "Duplicate id")
+    existing = storage.existing_ids(cls, ids)
+    for id in ids:
+        if id in existing:
+            abort(400, "Existing id {}".format(id))
+    for attr, parent in parents.items():
+        parent_ids = [item[attr] for item in data]
+        if not all(isinstance(id, str) for id in parent_ids):
+            abort(404)
+        parent_ids = set(parent_ids)
+        if len(storage.existing_ids(parent, parent_ids)) != len(parent_ids):
+            abort(404)
+    objs = storage.bulk_save(cls(**item) for item in data)
+    response = stream(objs)
+    response.status_code = 201
+    return response
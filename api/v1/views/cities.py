@@ -1,11 +1,12 @@
 #!/usr/bin/python3
 # api/v1/views/cities.py
 """Handles all default RESTFul API actions for Cities"""
-from flask import jsonify, abort, request
+from flask import jsonify, abort, g, request
 from models.state import State
 from models.city import City
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 
 
 @app_views.route(
@@ -15,13 +16,13 @@ def get_cities(state_id):
     Retrieves a list of all City objects of a State
 
     Returns:
-        A list of all City objects
+        A list of all City objects, one page at a time if `limit` or
+        `cursor` is given
     """
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
-    cities = state.cities
-    return jsonify([city.to_dict() for city in cities])
+    return paginate(City, state_id=state_id)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
@@ -35,9 +36,10 @@ def get_city(city_id):
     Returns:
         A City object, otherwise 404 error
     """
-    city = storage.get(City, city_id)
+    city = g.get('etag_object') or storage.get(City, city_id)
     if city is None:
         abort(404)
+    g.etag_object = city
     return jsonify(city.to_dict())
 
 
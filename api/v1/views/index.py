@@ -16,17 +16,12 @@ def status():
 @app_views.route('/stats', methods=['GET'])
 def stats():
     """Returns a JSON status 'OK'"""
-    amenities = storage.count('Amenity')
-    cities = storage.count('City')
-    places = storage.count('Place')
-    reviews = storage.count('Review')
-    states = storage.count('State')
-    users = storage.count('User')
+    counts = storage.counts()
     return jsonify({
-        "amenities": amenities,
-        "cities": cities,
-        "places": places,
-        "reviews": reviews,
-        "states": states,
-        "users": users
+        "amenities": counts['Amenity'],
+        "cities": counts['City'],
+        "places": counts['Place'],
+        "reviews": counts['Review'],
+        "states": counts['State'],
+        "users": counts['User']
         })
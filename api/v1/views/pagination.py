@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+# api/v1/views/pagination.py
+"""Cursor-based pagination and streaming of the list views"""
+from base64 import b64decode, urlsafe_b64encode
+from binascii import Error
+from flask import Response, abort, current_app, g, request, \
+    stream_with_context
+from models import storage
+from urllib.parse import urlencode
+
+# largest page a client can ask for
+MAX_LIMIT = 1000
+# number of objects serialized per chunk of a streamed response
+CHUNK_SIZE = 100
+
+
+def page_args():
+    """
+    Reads the `limit` and `cursor` query parameters
+
+    Returns:
+        A tuple (after_id, limit), or (None, None) if the request is not
+        paginated, otherwise error code 400
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    if limit is None and cursor is None:
+        return None, None
+    try:
+        limit = min(int(limit), MAX_LIMIT) if limit else MAX_LIMIT
+    except ValueError:
+        abort(400, "Invalid limit")
+    if limit < 1:
+        abort(400, "Invalid limit")
+    after_id = None
+    if cursor:
+        try:
+            after_id = b64decode(cursor, b'-_', validate=True).decode()
+        except (Error, ValueError):
+            abort(400, "Invalid cursor")
+    return after_id, limit
+
+
+def stream(objs):
+    """
+    Streams objects as a JSON array, or as newline delimited JSON if the
+    client asks for `application/x-ndjson`
+
+    Args:
+        objs (iterable): the objects, serialized as they are produced
+
+    Returns:
+        The streamed response
+    """
+    dumps = current_app.json.dumps
+    ndjson = request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+    def generate():
+        """yields the serialized objects, CHUNK_SIZE at a time"""
+        chunk = [] if ndjson else ["["]
+        for i, obj in enumerate(objs):
+            if ndjson:
+                chunk.append(dumps(obj.to_dict()) + "\n")
+            else:
+                chunk.append(("," if i else "") + dumps(obj.to_dict()))
+            if len(chunk) >= CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        if not ndjson:
+            chunk.append("]\n")
+        yield "".join(chunk)
+
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    # the storage is closed once the body is sent, not when the view returns
+    g.streaming = True
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+
+def page_response(objs, limit, cursor=None):
+    """
+    Builds the JSON response of one page
+
+    Args:
+        objs (iterable): the objects of the page, plus one more if there is
+            a next page
+        limit (int): size of the page, None if the request is not paginated
+        cursor (function): returns the cursor of the page after an object,
+            its id if None
+
+    Returns:
+        The streamed list of the objects, with a `Link` header to the next
+        page if there is one
+    """
+    if limit is None:
+        return stream(objs)
+    page = []
+    more = False
+    for obj in objs:
+        if len(page) == limit:
+            more = True
+            break
+        page.append(obj)
+    response = stream(page)
+    if more:
+        args = request.args.to_dict()
+        args['limit'] = limit
+        last = page[-1].id if cursor is None else cursor(page[-1])
+        args['cursor'] = urlsafe_b64encode(last.encode()).decode()
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
+
+
+def paginate(cls, **filters):
+    """
+    Lists the objects of a class one page at a time, in id order
+
+    Args:
+        cls (object): Class
+        filters: attribute values the objects must have, e.g. state_id
+
+    Returns:
+        The JSON response of the page asked for by the query parameters
+    """
+    after_id, limit = page_args()
+    fetch = None if limit is None else limit + 1
+    return page_response(storage.iter_all(cls, after_id, fetch, **filters),
+                         limit)
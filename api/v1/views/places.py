@@ -1,12 +1,17 @@
 #!/usr/bin/python3
 # api/v1/views/places.py
 """Handles all default RESTFul API actions for Places"""
-from flask import jsonify, abort, request
+from flask import jsonify, abort, g, request
+import json
 from models.city import City
 from models.place import Place
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import (MAX_LIMIT, page_args, page_response,
+                                     paginate, stream)
+from models.engine.geo import valid_point
+from models.engine.place_index import RANGE_ATTRS
 from os import getenv
 STORAGE_TYPE = getenv('HBNB_TYPE_STORAGE', "fs")
 
@@ -18,13 +23,13 @@ def get_places(city_id):
     Retrieves a list of all Place objects of a City
 
     Returns:
-        A list of all Place objects
+        A list of all Place objects, one page at a time if `limit` or
+        `cursor` is given
     """
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
-    places = city.places
-    return jsonify([place.to_dict() for place in places])
+    return paginate(Place, city_id=city_id)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -38,9 +43,10 @@ def get_place(place_id):
     Returns:
         A Place object, otherwise 404 error
     """
-    place = storage.get(Place, place_id)
+    place = g.get('etag_object') or storage.get(Place, place_id)
     if place is None:
         abort(404)
+    g.etag_object = place
     return jsonify(place.to_dict())
 
 
@@ -120,33 +126,121 @@ def update_place(place_id):
 def places_search():
     """
     Retrieves all Place objects depending of the JSON in the body of the
-    request.
+    request, one page at a time if `limit` or `cursor` is given.
+
+    Numeric attributes can be filtered with {"min": .., "max": ..} ranges,
+    e.g. {"price_by_night": {"max": 100}}, and `sort` orders the places by
+    one of them instead of by id. A `limit` in the body is used as the
+    page size if the query does not give one.
     """
+    after_id, limit = page_args()
     if not request.json:
         abort(400, "Not a JSON")
     data = request.get_json()
+    filters = search_filters(data)
+
+    sort = data.get('sort')
+    if sort is not None and sort not in RANGE_ATTRS:
+        abort(400, "Invalid sort")
+    if limit is None and data.get('limit') is not None:
+        limit = data['limit']
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            abort(400, "Invalid limit")
+        limit = min(limit, MAX_LIMIT)
+
+    after_value = None
+    cursor = None
+    if sort is not None:
+        if after_id is not None:
+            try:
+                after_value, after_id = json.loads(after_id)
+            except (TypeError, ValueError):
+                abort(400, "Invalid cursor")
+            if isinstance(after_value, bool) or \
+               not isinstance(after_value, (int, float)) or \
+               not isinstance(after_id, str):
+                abort(400, "Invalid cursor")
+
+        def cursor(place):
+            """returns the cursor of the page after place"""
+            return json.dumps([getattr(place, sort), place.id])
+
+    fetch = None if limit is None else limit + 1
+    places = storage.search_places(after_id=after_id, limit=fetch, sort=sort,
+                                   after_value=after_value, **filters)
+    return page_response(places, limit, cursor)
+
+
+def search_filters(data):
+    """
+    Reads the filters of places_search from the JSON of a request
+
+    Args:
+        data (dict): JSON in the body of the request
 
-    states = data.get('states', [])
-    cities = data.get('cities', [])
-    amenities = data.get('amenities', [])
-
-    places = set()
-    for state_id in states:
-        state = storage.get('State', state_id)
-        if state:
-            cities.extend([city.id for city in state.cities])
-
-    for city_id in cities:
-        city = storage.get('City', city_id)
-        if city:
-            places.update(city.places)
-
-    if amenities:
-        amenity_objects = storage.all('Amenity').values()
-        places = [place for place in places
-                  if all(
-                      amenity in place.amenities for amenity in amenity_objects
-                      )]
-
-    confirmed_places = [place.to_dict() for place in places]
-    return jsonify(confirmed_places)
+    Returns:
+        The states, cities, amenities and ranges keyword arguments of
+        storage.search_places(), otherwise error code 400
+    """
+    ranges = {}
+    for attr in RANGE_ATTRS:
+        bounds = data.get(attr)
+        if bounds is None:
+            continue
+        if not isinstance(bounds, dict):
+            abort(400, "Invalid {}".format(attr))
+        low, high = bounds.get('min'), bounds.get('max')
+        for bound in (low, high):
+            if bound is not None and (isinstance(bound, bool) or
+                                      not isinstance(bound, (int, float))):
+                abort(400, "Invalid {}".format(attr))
+        ranges[attr] = (low, high)
+    return {"states": data.get('states', []),
+            "cities": data.get('cities', []),
+            "amenities": data.get('amenities', []),
+            "ranges": ranges}
+
+
+@app_views.route('/places_nearby', methods=['GET', 'POST'],
+                 strict_slashes=False)
+def places_nearby():
+    """
+    Retrieves the Place objects nearest to the point given by the `lat` and
+    `lng` query parameters, nearest first.
+
+    `radius` bounds their distance in kilometers and `limit` their number,
+    at least one of them must be given. A POST request can also filter the
+    places with the JSON body of places_search.
+    """
+    try:
+        lat = float(request.args['lat'])
+        lng = float(request.args['lng'])
+    except (KeyError, ValueError):
+        abort(400, "Missing lat or lng")
+    if not valid_point(lat, lng):
+        abort(400, "Invalid lat or lng")
+    radius = request.args.get('radius')
+    limit = request.args.get('limit')
+    if radius is None and limit is None:
+        abort(400, "Missing radius or limit")
+    if radius is not None:
+        try:
+            radius = float(radius)
+        except ValueError:
+            abort(400, "Invalid radius")
+        if not radius >= 0:
+            abort(400, "Invalid radius")
+    if limit is not None:
+        try:
+            limit = min(int(limit), MAX_LIMIT)
+        except ValueError:
+            abort(400, "Invalid limit")
+        if limit < 1:
+            abort(400, "Invalid limit")
+
+    filters = {}
+    if request.method == 'POST':
+        if not request.json:
+            abort(400, "Not a JSON")
+        filters = search_filters(request.get_json())
+    return stream(storage.nearby_places(lat, lng, radius, limit, **filters))
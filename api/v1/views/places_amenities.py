@@ -30,10 +30,7 @@ def places_amenities(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    if STORAGE_TYPE == 'db':
-        amenities = place.amenities
-    else:
-        amenities = place.amenity_ids
+    amenities = place.amenities
     return jsonify([amenity.to_dict() for amenity in amenities])
 
 
@@ -62,9 +59,10 @@ def delete_place_amenity(place_id, amenity_id):
             abort(404)
         place.amenities.remove(amenity)
     else:
-        if amenity_id in place.amenity_ids:
+        if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        place.amenity_ids = [id for id in place.amenity_ids
+                             if id != amenity_id]
     place.save()
     return jsonify({}), 200
 
@@ -96,6 +94,6 @@ def link_place_amenity(place_id, amenity_id):
     else:
         if amenity_id in place.amenity_ids:
             return jsonify(amenity.to_dict()), 200
-        place.amenity_ids.append(amenity_id)
+        place.amenity_ids = place.amenity_ids + [amenity_id]
     place.save()
     return jsonify(amenity.to_dict()), 201
@@ -1,12 +1,13 @@
 #!/usr/bin/python3
 # api/v1/views/places_reviews.py
 """Handles all default RESTFul API actions for Reviews"""
-from flask import jsonify, abort, request
+from flask import jsonify, abort, g, request
 from models.place import Place
 from models.review import Review
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 
 
 @app_views.route(
@@ -16,13 +17,13 @@ def get_reviews(place_id):
     Retrieves a list of all Review objects of a Place
 
     Returns:
-        A list of all Review objects
+        A list of all Review objects, one page at a time if `limit` or
+        `cursor` is given
     """
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    reviews = place.reviews
-    return jsonify([review.to_dict() for review in reviews])
+    return paginate(Review, place_id=place_id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -36,9 +37,10 @@ def get_review(review_id):
     Returns:
         A Review object, otherwise 404 error
     """
-    review = storage.get(Review, review_id)
+    review = g.get('etag_object') or storage.get(Review, review_id)
     if review is None:
         abort(404)
+    g.etag_object = review
     return jsonify(review.to_dict())
 
 
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+# api/v1/views/search.py
+"""Handles the full-text search of Places and Reviews"""
+from flask import abort, request
+from models import storage
+from api.v1.views import app_views
+from api.v1.views.pagination import MAX_LIMIT, stream
+from models.engine.text_index import TEXT_FIELDS
+
+
+@app_views.route('/search', methods=['GET'], strict_slashes=False)
+def search():
+    """
+    Retrieves the Place and Review objects matching the words of the `q`
+    query parameter, best match first.
+
+    `type` restricts the search to Place or Review objects and `limit`
+    bounds the number of objects, MAX_LIMIT by default.
+    """
+    query = request.args.get('q')
+    if not query:
+        abort(400, "Missing q")
+    classes = None
+    if request.args.get('type'):
+        classes = [request.args['type']]
+        if classes[0] not in TEXT_FIELDS:
+            abort(400, "Invalid type")
+    try:
+        limit = min(int(request.args.get('limit', MAX_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        abort(400, "Invalid limit")
+    if limit < 1:
+        abort(400, "Invalid limit")
+    return stream(storage.search_text(query, limit, classes))
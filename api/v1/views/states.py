@@ -1,10 +1,11 @@
 #!/usr/bin/python3
 # api/v1/views/states.py
 """Handles all default RESTFul API actions for States"""
-from flask import jsonify, abort, request
+from flask import jsonify, abort, g, request
 from models.state import State
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
@@ -13,10 +14,10 @@ def get_states():
     Retrieves a list of all the State objects
 
     Returns:
-        A list of all State objects
+        A list of all State objects, one page at a time if `limit` or
+        `cursor` is given
     """
-    states = storage.all(State).values()
-    return jsonify([state.to_dict() for state in states])
+    return paginate(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -30,9 +31,10 @@ def get_state(state_id):
     Returns:
         A State object, otherwise 404 error
     """
-    state = storage.get(State, state_id)
+    state = g.get('etag_object') or storage.get(State, state_id)
     if state is None:
         abort(404)
+    g.etag_object = state
     return jsonify(state.to_dict())
 
 
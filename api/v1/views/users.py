@@ -1,10 +1,11 @@
 #!/usr/bin/python3
 # api/v1/views/users.py
 """Handles all default RESTFul API actions for Users"""
-from flask import jsonify, abort, request
+from flask import jsonify, abort, g, request
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
@@ -13,10 +14,10 @@ def get_users():
     Retrieves a list of all the User objects
 
     Returns:
-        A list of all User objects
+        A list of all User objects, one page at a time if `limit` or
+        `cursor` is given
     """
-    users = storage.all(User).values()
-    return jsonify([user.to_dict() for user in users])
+    return paginate(User)
 
 
 @app_views.route(
@@ -34,9 +35,10 @@ def get_user(user_id):
     Returns:
         An User object, otherwise 404 error
     """
-    user = storage.get(User, user_id)
+    user = g.get('etag_object') or storage.get(User, user_id)
     if user is None:
         abort(404)
+    g.etag_object = user
     return jsonify(user.to_dict())
 
 
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""
+Measures the latency of the DBStorage lookups by foreign key, email, price
+and location without the indexes the models declare, then with them
+
+Usage: HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/hbnb.db \
+    ./benchmarks/index_lookup.py [number of places]
+The database must be empty: its indexes are dropped then created again.
+"""
+from datetime import datetime
+from itertools import islice
+import os
+import random
+import statistics
+import sys
+import timeit
+import uuid
+# the models are imported from the repository root, wherever it is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+import models
+from models import storage
+
+# number of timed calls of each lookup
+CALLS = 20
+# number of rows inserted by statement
+CHUNK = 10000
+
+
+def insert(table, rows):
+    """inserts the rows of a table by chunks of CHUNK rows"""
+    engine = storage._DBStorage__engine
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK))
+        if not chunk:
+            return
+        with engine.begin() as connection:
+            connection.execute(table.insert(), chunk)
+
+
+def generate(n):
+    """inserts n places and reviews, n / 10 users, n / 100 cities and 50
+    states; returns the ids of each table"""
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+    rng = random.Random(n)
+    now = datetime.utcnow()
+    ids = {}
+
+    def rows(cls, size, columns):
+        """returns size rows of cls, columns(i) giving their attributes"""
+        ids[cls.__name__] = [str(uuid.UUID(int=rng.getrandbits(128)))
+                             for i in range(size)]
+        for i, id in enumerate(ids[cls.__name__]):
+            row = {"id": id, "created_at": now, "updated_at": now}
+            row.update(columns(i))
+            yield row
+    insert(State.__table__, rows(State, 50, lambda i: {
+        "name": "State{}".format(i)}))
+    insert(City.__table__, rows(City, n // 100 + 1, lambda i: {
+        "name": "City{}".format(i), "state_id": rng.choice(ids["State"])}))
+    insert(User.__table__, rows(User, n // 10 + 1, lambda i: {
+        "email": "user{}@hbnb.io".format(i), "password": "pwd"}))
+    insert(Place.__table__, rows(Place, n, lambda i: {
+        "name": "Place", "city_id": rng.choice(ids["City"]),
+        "user_id": rng.choice(ids["User"]),
+        "number_rooms": rng.randint(1, 6),
+        "number_bathrooms": rng.randint(1, 3),
+        "max_guest": rng.randint(1, 12),
+        "price_by_night": rng.randint(20, 500),
+        "latitude": rng.uniform(25, 49), "longitude": rng.uniform(-124, -67)}))
+    insert(Review.__table__, rows(Review, n, lambda i: {
+        "text": "Review", "place_id": rng.choice(ids["Place"]),
+        "user_id": rng.choice(ids["User"])}))
+    return ids
+
+
+def lookups(ids):
+    """returns the (label, function) of the timed lookups, each function
+    taking a random.Random"""
+    def cities(rng):
+        """lists the cities of a state"""
+        return list(storage.iter_all("City",
+                                     state_id=rng.choice(ids["State"])))
+
+    def places(rng):
+        """lists the places of a city"""
+        return list(storage.iter_all("Place",
+                                     city_id=rng.choice(ids["City"])))
+
+    def reviews(rng):
+        """lists the reviews of a place"""
+        return list(storage.iter_all("Review",
+                                     place_id=rng.choice(ids["Place"])))
+
+    def user(rng):
+        """finds a user by email"""
+        return list(storage.iter_all("User", email="user{}@hbnb.io".format(
+            rng.randrange(len(ids["User"])))))
+
+    def price(rng):
+        """searches the cheapest places of a price range"""
+        low = rng.randint(20, 480)
+        return list(storage.search_places(
+            ranges={"price_by_night": (low, low + 20)},
+            sort="price_by_night", limit=50))
+
+    def nearby(rng):
+        """searches the places nearest to a point"""
+        return storage.nearby_places(rng.uniform(25, 49),
+                                     rng.uniform(-124, -67), radius=10,
+                                     limit=10)
+    return [("cities by state", cities), ("places by city", places),
+            ("reviews by place", reviews), ("user by email", user),
+            ("places by price", price), ("places nearby", nearby)]
+
+
+def measure(ids):
+    """returns the median latency of each lookup, in milliseconds"""
+    latencies = []
+    for label, function in lookups(ids):
+        rng = random.Random(0)
+        times = []
+        for i in range(CALLS):
+            start = timeit.default_timer()
+            function(rng)
+            times.append(timeit.default_timer() - start)
+            storage.close()
+        latencies.append((label, statistics.median(times) * 1000))
+    return latencies
+
+
+def main(n):
+    """prints the latencies before and after creating the indexes"""
+    from models.base_model import Base
+    engine = storage._DBStorage__engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(bind=engine)
+    start = timeit.default_timer()
+    ids = generate(n)
+    print("inserted {:d} places in {:.1f}s".format(
+        n, timeit.default_timer() - start))
+    before = measure(ids)
+    start = timeit.default_timer()
+    created = storage.create_indexes()
+    print("created {:d} indexes in {:.1f}s".format(
+        len(created), timeit.default_timer() - start))
+    after = measure(ids)
+    print("{:18s} {:>12s} {:>12s} {:>9s}".format(
+        "lookup", "before (ms)", "after (ms)", "speedup"))
+    for (label, slow), (label, fast) in zip(before, after):
+        print("{:18s} {:12.3f} {:12.3f} {:8.0f}x".format(
+            label, slow, fast, slow / fast))
+
+
+if __name__ == "__main__":
+    if models.storage_t != "db":
+        sys.exit("set HBNB_TYPE_STORAGE=db to benchmark the database")
+    if storage.count():
+        sys.exit("the database must be empty")
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
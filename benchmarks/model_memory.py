@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Measures the memory taken by the reloaded file storage records of each
+model, as regular instances, as the raw dictionaries lazy mode keeps and
+as the encoded records compact mode keeps
+
+Usage: ./benchmarks/model_memory.py [number of records per class]
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+import uuid
+# the models are imported from the repository root, wherever it is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+import models
+from models.engine.compact import RecordStore
+from models.engine.file_storage import classes
+
+
+def records(name, n):
+    """returns the JSON text of n distinct records of class name, every
+    attribute the class declares being set"""
+    cls = classes[name]
+    sample = cls().to_dict()
+    for attr, value in vars(cls).items():
+        if not attr.startswith("_") and not callable(value) and \
+           not isinstance(value, property) and attr not in sample:
+            sample[attr] = value
+    rows = {}
+    for i in range(n):
+        sample["id"] = str(uuid.uuid4())
+        rows[name + "." + sample["id"]] = dict(sample)
+    return json.dumps(rows)
+
+
+def measure(build, text, n):
+    """returns the bytes per record kept by build(records), the records
+    being read from text like reload() reads the JSON file"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build(json.loads(text))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / n
+
+
+def objects(name):
+    """returns a function building regular instances of class name"""
+    cls = classes[name]
+    return lambda records: {key: cls(**value)
+                            for key, value in records.items()}
+
+
+def dictionaries(records):
+    """returns the records as they are read"""
+    return records
+
+
+def encoded(records):
+    """returns the records in a RecordStore"""
+    return RecordStore(records.items())
+
+
+def main(n):
+    """prints the bytes per record of every model"""
+    print("{:10s} {:>8s} {:>8s} {:>8s}".format(
+        "class", "objects", "lazy", "compact"))
+    for name in classes:
+        text = records(name, n)
+        print("{:10s} {:8.0f} {:8.0f} {:8.0f}".format(
+            name, measure(objects(name), text, n),
+            measure(dictionaries, text, n), measure(encoded, text, n)))
+
+
+if __name__ == "__main__":
+    if models.storage_t == "db":
+        sys.exit("unset HBNB_TYPE_STORAGE to benchmark file storage")
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
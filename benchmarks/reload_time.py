@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Measures FileStorage.reload() and the timestamp parse/format paths of
+BaseModel on a generated dataset
+
+Usage: ./benchmarks/reload_time.py [number of objects]
+Set HBNB_FS_LAZY=1 to time a lazy reload.
+"""
+from datetime import datetime
+import json
+import os
+import sys
+import tempfile
+import timeit
+# the models are imported from the repository root, wherever it is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+import models
+from models.base_model import format_time, parse_time, time
+from models.engine.file_storage import FileStorage
+
+
+def generate(path, n):
+    """writes n State records to the JSON file at path"""
+    stamp = datetime.utcnow().strftime(time)
+    with open(path, 'w') as f:
+        json.dump({"State.{:d}".format(i): {"__class__": "State",
+                                            "id": str(i),
+                                            "name": "state",
+                                            "created_at": stamp,
+                                            "updated_at": stamp}
+                   for i in range(n)}, f)
+
+
+def main(n):
+    """prints the timings for n objects"""
+    stamp = datetime.utcnow().strftime(time)
+    value = datetime.utcnow()
+    for label, stmt in [
+            ("strptime", lambda: datetime.strptime(stamp, time)),
+            ("parse_time", lambda: parse_time(stamp)),
+            ("strftime", lambda: value.strftime(time)),
+            ("format_time", lambda: format_time(value))]:
+        print("{:12s} {:8.3f}s for {:d} calls".format(
+            label, timeit.timeit(stmt, number=n), n))
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        generate(path, n)
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__buckets = {}
+        FileStorage._FileStorage__raw = {}
+        start = timeit.default_timer()
+        storage.reload()
+        print("{:12s} {:8.3f}s for {:d} objects".format(
+            "reload", timeit.default_timer() - start, storage.count()))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    if models.storage_t == "db":
+        sys.exit("unset HBNB_TYPE_STORAGE to benchmark file storage")
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+"""
+Times the same operations of FileStorage and of DBStorage on SQLite, on
+the same generated dataset, and checks both engines return the same
+results
+
+Usage: ./benchmarks/storage_parity.py [number of places]
+Each engine runs in its own process, in a temporary directory, since the
+models are declared for one storage type only.
+"""
+from hashlib import sha1
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+import uuid
+
+WORDS = ("cozy", "loft", "view", "quiet", "garden", "pool", "downtown",
+         "beach", "studio", "family", "modern", "rustic", "cabin", "lake")
+
+
+def generate(n):
+    """returns the objects of a dataset of n places, the same for a given
+    n whatever the storage type"""
+    import models
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+    rng = random.Random(n)
+
+    def new_id():
+        """returns a random id drawn from rng"""
+        return str(uuid.UUID(int=rng.getrandbits(128)))
+
+    def text(size):
+        """returns size random words"""
+        return " ".join(rng.choice(WORDS) for i in range(size))
+    states = [State(id=new_id(), name="State{}".format(i))
+              for i in range(n // 100 + 1)]
+    cities = [City(id=new_id(), name="City{}".format(i),
+                   state_id=rng.choice(states).id)
+              for i in range(n // 10 + 1)]
+    users = [User(id=new_id(), email="user{}@hbnb.io".format(i),
+                  password="pwd") for i in range(n // 10 + 1)]
+    amenities = [Amenity(id=new_id(), name=word) for word in WORDS]
+    places = []
+    reviews = []
+    for i in range(n):
+        place = Place(id=new_id(), name=text(2), description=text(12),
+                      city_id=rng.choice(cities).id,
+                      user_id=rng.choice(users).id,
+                      number_rooms=rng.randint(1, 6),
+                      number_bathrooms=rng.randint(1, 3),
+                      max_guest=rng.randint(1, 12),
+                      price_by_night=rng.randint(20, 500),
+                      latitude=rng.uniform(25, 49),
+                      longitude=rng.uniform(-124, -67))
+        chosen = rng.sample(amenities, 3)
+        if models.storage_t == "db":
+            place.amenities.extend(chosen)
+        else:
+            place.amenity_ids = [amenity.id for amenity in chosen]
+        places.append(place)
+        reviews.append(Review(id=new_id(), text=text(20), place_id=place.id,
+                              user_id=rng.choice(users).id))
+    return states + cities + users + amenities + places + reviews
+
+
+def operations(objs):
+    """returns the (label, number of calls, function) of the timed
+    operations, each function returning a result to compare"""
+    from models import storage
+    rng = random.Random(0)
+    names = {}
+    for obj in objs:
+        names.setdefault(obj.__class__.__name__, []).append(obj.id)
+    place_ids = rng.sample(names["Place"], min(1000, len(names["Place"])))
+    state_ids = names["State"]
+    amenity_ids = names["Amenity"]
+
+    def get():
+        """gets places by id"""
+        return [storage.get("Place", id).id for id in place_ids]
+
+    def cities():
+        """lists the cities of every state"""
+        return [[city.id for city in storage.iter_all("City", state_id=id)]
+                for id in state_ids]
+
+    def search():
+        """searches places of some states with an amenity and a price"""
+        return [place.id for place in storage.search_places(
+            states=state_ids[::3], amenities=amenity_ids[:1],
+            ranges={"price_by_night": (None, 200)}, limit=50)]
+
+    def nearby():
+        """searches the places nearest to a point"""
+        return [place.id for place in storage.nearby_places(
+            37.77, -122.42, radius=500, limit=20)]
+
+    def text():
+        """searches places and reviews by words"""
+        return [obj.id for obj in storage.search_text(
+            "cozy garden pool", limit=20)]
+
+    def counts():
+        """counts the objects of every class of the dataset"""
+        counts = storage.counts()
+        return {name: counts[name] for name in names}
+    return [("get", len(place_ids), get), ("cities", 1, cities),
+            ("search_places", 10, search), ("nearby_places", 10, nearby),
+            ("search_text", 10, text), ("counts", 10, counts)]
+
+
+def run(n):
+    """times the operations with the storage of this process, printing
+    (label, seconds, digest of the result) rows as JSON"""
+    from models import storage
+    objs = generate(n)
+    start = timeit.default_timer()
+    for obj in objs:
+        storage.new(obj)
+    storage.save()
+    rows = [("insert", timeit.default_timer() - start, "")]
+    storage.close()
+    storage.reload()
+    for label, calls, function in operations(objs):
+        result = function()
+        digest = sha1(json.dumps(result, sort_keys=True).encode())
+        seconds = timeit.timeit(function, number=1)
+        rows.append((label, seconds / calls, digest.hexdigest()[:12]))
+    print(json.dumps(rows))
+
+
+def main(n):
+    """runs both engines and prints their timings side by side"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for engine in ("fs", "db"):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=root, HBNB_TYPE_STORAGE=engine,
+                       HBNB_ENV="")
+            if engine == "db":
+                env["HBNB_DB_URL"] = "sqlite:///" + os.path.join(
+                    directory, "hbnb.db")
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", str(n)],
+                cwd=directory, env=env, check=True, stdout=subprocess.PIPE)
+            results[engine] = json.loads(output.stdout.decode().
+                                         splitlines()[-1])
+    print("{:14s} {:>12s} {:>12s} {:>6s}".format(
+        "operation", "file (s)", "sqlite (s)", "same"))
+    for fs, db in zip(results["fs"], results["db"]):
+        print("{:14s} {:12.6f} {:12.6f} {:>6s}".format(
+            fs[0], fs[1], db[1], "yes" if fs[2] == db[2] else "NO"))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--run":
+        run(int(sys.argv[2]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -14,6 +14,34 @@ import uuid
 time = "%Y-%m-%dT%H:%M:%S.%f"
 STORAGE_TYPE = getenv('HBNB_TYPE_STORAGE')
 
+
+def parse_time(value):
+    """parses a timestamp in the `time` format
+
+    Timestamps laid out as to_dict() writes them, with every separator and
+    ASCII digit in place, take the fromisoformat() fast path; anything else
+    goes through strptime(), so ISO forms `time` lacks (week dates, time
+    zones) are still rejected.
+    """
+    if len(value) == 26 and value[4] == value[7] == "-" and \
+       value[10] == "T" and value[13] == value[16] == ":" and \
+       value[19] == ".":
+        digits = value[:4] + value[5:7] + value[8:10] + value[11:13] + \
+            value[14:16] + value[17:19] + value[20:]
+        if digits.isascii() and digits.isdigit():
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                parsed = None
+            if parsed is not None and parsed.tzinfo is None:
+                return parsed
+    return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """formats a naive datetime in the `time` format"""
+    return value.isoformat(timespec="microseconds")
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -22,6 +50,9 @@ else:
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # the cached to_dict() output lives outside of __dict__
+    __slots__ = ("__dict__", "__weakref__", "__cache")
+
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -34,11 +65,11 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -48,6 +79,28 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    def __setattr__(self, name, value):
+        """sets an attribute, dropping the cached to_dict() output, and
+        reports the change to file storage"""
+        if models.storage_t == "db":
+            super().__setattr__(name, value)
+            return
+        old = getattr(self, name, None)
+        super().__setattr__(name, value)
+        object.__setattr__(self, "_BaseModel__cache", None)
+        models.storage.changed(self, name, old)
+
+    def __delattr__(self, name):
+        """deletes an attribute, dropping the cached to_dict() output, and
+        reports the change to file storage"""
+        if models.storage_t == "db":
+            super().__delattr__(name)
+            return
+        old = getattr(self, name, None)
+        super().__delattr__(name)
+        object.__setattr__(self, "_BaseModel__cache", None)
+        models.storage.changed(self, name, old)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -60,15 +113,37 @@ class BaseModel:
         models.storage.save()
 
     def to_dict(self, save_to_disk=False):
-        """returns a dictionary containing all keys/values of the instance"""
+        """returns a dictionary containing all keys/values of the instance
+
+        In file storage mode the dictionary is cached until an attribute is
+        set or deleted, and callers get a copy of it.
+        The database can load attributes without going through __setattr__,
+        so nothing is cached in db mode.
+        """
+        if models.storage_t == "db":
+            return self.__to_dict(save_to_disk)
+        cache = getattr(self, "_BaseModel__cache", None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, "_BaseModel__cache", cache)
+        new_dict = cache.get(save_to_disk)
+        if new_dict is None:
+            new_dict = self.__to_dict(save_to_disk)
+            cache[save_to_disk] = new_dict
+        return dict(new_dict)
+
+    def __to_dict(self, save_to_disk):
+        """builds the dictionary returned by to_dict()"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+            for name in self.__mapper__.relationships.keys():
+                new_dict.pop(name, None)
         if not save_to_disk:
             new_dict.pop("password", None)
         return new_dict
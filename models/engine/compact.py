@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Contains RecordStore, which keeps the records FileStorage has not turned
+into objects yet packed, so millions of reloaded records stay small
+"""
+
+from collections.abc import MutableMapping
+import json
+
+
+def encode(value):
+    """returns the record value as compact UTF-8 JSON"""
+    return json.dumps(value, ensure_ascii=False,
+                      separators=(",", ":")).encode()
+
+
+class RecordStore(MutableMapping):
+    """
+    Records of one class by <class name>.id, each kept as its JSON text
+
+    A record read from the JSON file is a dictionary holding a string per
+    value, timestamps included; its encoded text is a single bytes object
+    a third of that size or less. Records are decoded again on every read,
+    so FileStorage only keeps here those not looked up yet.
+    """
+
+    def __init__(self, records=()):
+        """
+        Instantiate a RecordStore
+
+        Args:
+            records (iterable): (key, record) pairs to store
+        """
+        # dictionary - encoded record by <class name>.id
+        self.__records = {}
+        for key, value in records:
+            self[key] = value
+
+    def __getitem__(self, key):
+        """returns a new dictionary of the record stored under key"""
+        return json.loads(self.__records[key])
+
+    def __setitem__(self, key, value):
+        """stores the record value, a dictionary, under key"""
+        self.__records[key] = encode(value)
+
+    def __delitem__(self, key):
+        """removes the record stored under key"""
+        del self.__records[key]
+
+    def __contains__(self, key):
+        """tells whether a record is stored under key, without decoding
+        it"""
+        return key in self.__records
+
+    def __iter__(self):
+        """iterates over the keys of the records"""
+        return iter(self.__records)
+
+    def __len__(self):
+        """returns the number of records"""
+        return len(self.__records)
@@ -7,54 +7,593 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.geo import bounding_box, distance, nearest
+from models.engine.text_index import (TEXT_FIELDS, bm25, document_text,
+                                      tokenize)
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from collections import Counter
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import (Column, Integer, String, Table, and_, create_engine,
+                        delete, event, func, insert, or_, select, update)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+from datetime import datetime
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# longest indexed word, longer ones are cut
+MAX_TERM = 128
+
+if models.storage_t == "db":
+    # full-text index of the places and reviews, kept in the database so
+    # every process searches what the others committed: the length in
+    # words of each <class name>.id document, and the frequency of each
+    # of its words; terms are compared byte for byte, since the default
+    # MySQL collation would take "cafe" and "café" for the same key
+    text_documents = Table('text_documents', Base.metadata,
+                           Column('document', String(128), primary_key=True),
+                           Column('length', Integer, nullable=False))
+    text_postings = Table('text_postings', Base.metadata,
+                          Column('term', String(MAX_TERM).with_variant(
+                              mysql.VARCHAR(MAX_TERM, charset='utf8mb4',
+                                            collation='utf8mb4_bin'),
+                              'mysql'), primary_key=True),
+                          Column('document', String(128), primary_key=True,
+                                 index=True),
+                          Column('tf', Integer, nullable=False))
+    # number of flushes that added, changed or deleted rows by class name,
+    # counted in the transaction of the changes so every process sees the
+    # versions the others committed
+    class_versions = Table('class_versions', Base.metadata,
+                           Column('name', String(60), primary_key=True),
+                           Column('version', Integer, nullable=False))
+
+
+# pragmas set on every SQLite connection: write-ahead logging so readers
+# do not block the writer, synced at checkpoints only, foreign keys
+# enforced as by MySQL, a wait instead of "database is locked" errors, and
+# a 64MB page cache
+SQLITE_PRAGMAS = (("journal_mode", "WAL"), ("synchronous", "NORMAL"),
+                  ("foreign_keys", "ON"), ("busy_timeout", "5000"),
+                  ("temp_store", "MEMORY"), ("cache_size", "-65536"))
+
+
+def sqlite_engine(url, pool):
+    """
+    Creates the engine of a SQLite database
+
+    An in-memory database lives as long as its connection, so a single
+    connection is shared by every thread; a file database uses the pool.
+
+    Args:
+        url (str): sqlite:// URL, in memory if it names no file
+        pool (dict): pool arguments of create_engine() for a file
+
+    Returns:
+        The engine, setting SQLITE_PRAGMAS on its connections
+    """
+    kwargs = {"connect_args": {"check_same_thread": False}}
+    if make_url(url).database in (None, "", ":memory:"):
+        kwargs["poolclass"] = StaticPool
+    else:
+        kwargs.update(pool)
+    engine = create_engine(url, **kwargs)
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(connection, record):
+        """sets the pragmas on a new connection"""
+        cursor = connection.cursor()
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute("PRAGMA {} = {}".format(name, value))
+        cursor.close()
+    return engine
+
+
+def env_int(name, default):
+    """returns the integer value of an environment variable, default if
+    it is not set"""
+    value = getenv(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # number of rows fetched per round trip by iter_all()
+    __batch_size = 1000
+    # list - functions called with the key of every new, changed or deleted
+    # object, once flushed
+    __listeners = []
+    # dictionary - number of rows by class name, None until counts() reads
+    # them again
+    __counts = None
+    # float - time.monotonic() past which counts() reads them again
+    __counts_expiry = 0
+    # number of seconds counts are kept for, bounding how long the writes
+    # of other processes go unnoticed
+    __counts_ttl = 5
 
     def __init__(self):
-        """Instantiate a DBStorage object"""
+        """Instantiate a DBStorage object
+
+        The database is MySQL, unless HBNB_DB_URL gives the URL of another
+        one such as sqlite:///hbnb.db, or sqlite:// for an in-memory one.
+        """
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        # pool of connections shared by the threads of the app: pool_size
+        # kept open, max_overflow more opened under load, pool_timeout
+        # seconds waited for one beyond that; connections older than
+        # pool_recycle seconds are replaced before MySQL's wait_timeout
+        # drops them, and pre-ping replaces those dropped anyway
+        pool_size = env_int('HBNB_MYSQL_POOL_SIZE', 5)
+        self.__warmup = env_int('HBNB_MYSQL_POOL_WARMUP', pool_size)
+        pool = {"pool_size": pool_size,
+                "max_overflow": env_int('HBNB_MYSQL_MAX_OVERFLOW', 10),
+                "pool_timeout": env_int('HBNB_MYSQL_POOL_TIMEOUT', 30),
+                "pool_recycle": env_int('HBNB_MYSQL_POOL_RECYCLE', 3600),
+                "pool_pre_ping":
+                getenv('HBNB_MYSQL_POOL_PRE_PING', '1') != '0'}
+        url = getenv('HBNB_DB_URL')
+        if url is None:
+            url = 'mysql+mysqldb://{}:{}@{}/{}'.format(HBNB_MYSQL_USER,
+                                                       HBNB_MYSQL_PWD,
+                                                       HBNB_MYSQL_HOST,
+                                                       HBNB_MYSQL_DB)
+        if url.startswith('sqlite'):
+            self.__engine = sqlite_engine(url, pool)
+        else:
+            self.__engine = create_engine(url, **pool)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=None):
+        """
+        query on the current database session
+
+        Args:
+            cls (object): Class or class name, all classes if None
+            load (list): load plan, the relationships of cls to load with
+                the objects, e.g. ["cities"] or ["cities.places"]; each
+                relationship costs one more query whatever the number of
+                objects, instead of one query per object when accessed
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if load:
+                    query = query.options(*self.__load(classes[clss], load))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter_all(self, cls, after_id=None, limit=None, load=None,
+                 **filters):
+        """
+        Iterates over the objects of a class in id order
+
+        Rows are fetched in batches, starting after after_id (keyset
+        pagination), so memory stays flat whatever the table size.
+
+        Args:
+            cls (object): Class or class name
+            after_id (str): only yield objects with an id greater than it
+            limit (int): maximum number of objects to yield
+            load (list): load plan of all(), loaded batch by batch
+            filters: column values the objects must have, e.g.
+                state_id="..."
+
+        Returns:
+            A generator of the objects
+        """
+        cls = self.__class(cls)
+        if cls is None:
+            return
+        query = self.__session.query(cls).filter_by(**filters)
+        if load:
+            query = query.options(*self.__load(cls, load))
+        query = query.order_by(cls.id)
+        if after_id is not None:
+            query = query.filter(cls.id > after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        for obj in query.yield_per(self.__batch_size):
+            yield obj
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      after_id=None, limit=None, ranges=None, sort=None,
+                      after_value=None):
+        """
+        Searches places with a single query
+
+        Args:
+            states (list): ids of states whose places are wanted
+            cities (list): ids of cities whose places are wanted
+            amenities (list): ids of amenities every place must have
+            after_id (str): only return places with an id greater than it,
+                or after (after_value, after_id) in sort order
+            limit (int): maximum number of places to return
+            ranges (dict): (min, max) bounds by attribute of RANGE_ATTRS,
+                either bound may be None
+            sort (str): attribute of RANGE_ATTRS to order places by
+            after_value (float): value of sort the places start after
+
+        Rows are fetched in batches of __batch_size, as by iter_all().
+
+        Returns:
+            A generator of the matching places in id order, or in (sort, id)
+            order. Places of every city are matched if no state nor city is
+            given.
+        """
+        query = self.__search_query(states, cities, amenities, ranges)
+        if sort is not None:
+            column = getattr(Place, sort)
+            if after_id is not None:
+                query = query.filter(or_(column > after_value,
+                                         and_(column == after_value,
+                                              Place.id > after_id)))
+            query = query.order_by(column, Place.id)
+        else:
+            if after_id is not None:
+                query = query.filter(Place.id > after_id)
+            query = query.order_by(Place.id)
+        if limit is not None:
+            query = query.limit(limit)
+        for place in query.yield_per(self.__batch_size):
+            yield place
+
+    def nearby_places(self, lat, lng, radius=None, limit=None, states=(),
+                      cities=(), amenities=(), ranges=None):
+        """
+        Searches the places nearest to a point
+
+        Each step of the search only selects the places of the bounding box
+        of a circle on the latitude and longitude columns, the exact
+        distances are then computed for these places.
+
+        Args:
+            lat (float): latitude of the point, in degrees
+            lng (float): longitude of the point, in degrees
+            radius (float): largest distance of the places, in kilometers
+            limit (int): maximum number of places to return
+            states, cities, amenities, ranges: filters of search_places
+
+        Returns:
+            The list of matching places, nearest first
+        """
+        query = self.__search_query(states, cities, amenities, ranges)
+
+        def within(radius):
+            """returns the (distance, place) pairs within radius"""
+            lat_min, lat_max, lng_ranges = bounding_box(lat, lng, radius)
+            box = query.filter(Place.latitude.between(lat_min, lat_max),
+                               or_(*(Place.longitude.between(low, high)
+                                     for low, high in lng_ranges)))
+            pairs = []
+            for place in box:
+                d = distance(lat, lng, place.latitude, place.longitude)
+                if d <= radius:
+                    pairs.append((d, place))
+            return pairs
+
+        return [place for d, place in nearest(within, radius, limit)]
+
+    def search_text(self, query, limit=None, classes=None):
+        """
+        Searches places and reviews by the words of their text
+
+        Args:
+            query (str): text of the query
+            limit (int): maximum number of objects to return
+            classes (list): names of the classes searched, all if None
+
+        The index is read from its tables rather than kept in memory, so it
+        holds what every process committed.
+
+        Returns:
+            The list of matching objects, best BM25 score first
+        """
+        terms = {term[:MAX_TERM] for term in tokenize(query)}
+        size, length = self.__session.query(
+            func.count(), func.coalesce(func.sum(text_documents.c.length), 0)
+        ).select_from(text_documents).one()
+        if not size or not terms:
+            return []
+        matches = {}
+        for term, doc, tf, doc_length in self.__session.execute(
+                select(text_postings.c.term, text_postings.c.document,
+                       text_postings.c.tf, text_documents.c.length).
+                join(text_documents, text_documents.c.document ==
+                     text_postings.c.document).
+                where(text_postings.c.term.in_(terms))):
+            matches.setdefault(term, []).append((doc, tf, doc_length))
+        scores = {}
+        for found in matches.values():
+            for doc, score in bm25(found, size, length / size):
+                scores[doc] = scores.get(doc, 0.0) + score
+        if classes is not None:
+            prefixes = tuple(name + "." for name in classes)
+            scores = {doc: score for doc, score in scores.items()
+                      if doc.startswith(prefixes)}
+        keys = sorted(scores, key=lambda doc: (-scores[doc], doc))
+        objs = []
+        for key in keys if limit is None else keys[:limit]:
+            obj = self.get(*key.split(".", 1))
+            if obj is not None:
+                objs.append(obj)
+        return objs
+
+    def listen(self, callback):
+        """registers callback(key) to be called with the <class name>.id key
+        of every object added, changed or deleted, once flushed then again
+        once committed, what was read in between being the old rows"""
+        self.__listeners.append(callback)
+
+    def version(self, cls):
+        """
+        Returns a string that changes whenever an object of cls is added,
+        changed or deleted
+
+        It is read from the class_versions table, which every flush
+        changing rows of cls updates, so it changes with the writes of
+        other processes as soon as they are committed.
+        """
+        cls = self.__class(cls)
+        version = self.__session.execute(
+            select(class_versions.c.version).
+            where(class_versions.c.name == cls.__name__)).scalar()
+        return str(version or 0)
+
+    def __flushed(self, session, flush_context):
+        """updates the full-text index and the versions of the classes with
+        the objects of a flush and calls the listeners"""
+        new = session.new
+        deleted = session.deleted
+        if new or deleted:
+            self.__counts = None
+            session.info["counted"] = False
+        removed = []
+        added = []
+        names = set()
+        for obj in list(new) + list(session.dirty) + list(deleted):
+            name = obj.__class__.__name__
+            names.add(name)
+            key = name + "." + obj.id
+            if name in TEXT_FIELDS:
+                # only the objects whose text changed are indexed again
+                changed = obj in new
+                if not changed:
+                    attrs = sqlalchemy.inspect(obj).attrs
+                    changed = obj in deleted or any(
+                        attrs[attr].history.has_changes()
+                        for attr in TEXT_FIELDS[name])
+                    if changed:
+                        removed.append(key)
+                if changed and obj not in deleted:
+                    added.append((key, document_text(
+                        name, lambda attr: getattr(obj, attr, None))))
+            session.info.setdefault("changed", set()).add(key)
+            for callback in self.__listeners:
+                callback(key)
+        connection = session.connection()
+        self.__index_text(connection, removed, added)
+        if names:
+            connection.execute(
+                update(class_versions).
+                where(class_versions.c.name.in_(sorted(names))).
+                values(version=class_versions.c.version + 1))
+
+    def __index_text(self, connection, removed, added):
+        """
+        Updates the full-text index tables
+
+        Args:
+            connection (Connection): connection of the transaction
+            removed (list): keys of the documents dropped from the index
+            added (list): (key, text) of the documents indexed, after
+                those removed
+        """
+        for start in range(0, len(removed), self.__batch_size):
+            batch = removed[start:start + self.__batch_size]
+            connection.execute(delete(text_postings).where(
+                text_postings.c.document.in_(batch)))
+            connection.execute(delete(text_documents).where(
+                text_documents.c.document.in_(batch)))
+        for start in range(0, len(added), self.__batch_size):
+            documents = []
+            postings = []
+            for key, text in added[start:start + self.__batch_size]:
+                terms = Counter(term[:MAX_TERM] for term in tokenize(text))
+                if not terms:
+                    continue
+                documents.append({"document": key,
+                                  "length": sum(terms.values())})
+                postings.extend({"term": term, "document": key, "tf": tf}
+                                for term, tf in terms.items())
+            if documents:
+                connection.execute(insert(text_documents), documents)
+                connection.execute(insert(text_postings), postings)
+
+    def __build_text(self):
+        """indexes the text of every place and review again"""
+        connection = self.__session.connection()
+        connection.execute(delete(text_postings))
+        connection.execute(delete(text_documents))
+        for name in TEXT_FIELDS:
+            added = []
+            for obj in self.__session.query(self.__class(name)).\
+                    yield_per(self.__batch_size):
+                added.append((name + "." + obj.id, document_text(
+                    name, lambda attr: getattr(obj, attr, None))))
+                if len(added) == self.__batch_size:
+                    self.__index_text(connection, [], added)
+                    added = []
+            self.__index_text(connection, [], added)
+        self.save()
+
+    def __committed(self, session):
+        """drops the counts read while the rows of the session were not
+        committed yet, and calls the listeners again"""
+        if session.info.pop("counted", True) is False:
+            self.__counts = None
+        for key in session.info.pop("changed", ()):
+            for callback in self.__listeners:
+                callback(key)
+
+    def __ended(self, session, transaction):
+        """drops the counts read and calls the listeners again for the
+        changes flushed by a transaction that ended without a commit,
+        rolled back or discarded by close()"""
+        if transaction.parent is not None:
+            return
+        if session.info.pop("counted", True) is False:
+            self.__counts = None
+        for key in session.info.pop("changed", ()):
+            for callback in self.__listeners:
+                callback(key)
+
+    def __load(self, cls, load):
+        """
+        Returns the loader options of a load plan
+
+        Args:
+            cls (class): mapped class the plan starts from
+            load (list): relationship paths, dot-separated
+
+        Returns:
+            The list of selectinload() options, otherwise raises ValueError
+            for a name that is not a relationship
+        """
+        options = []
+        for path in load:
+            option = None
+            owner = cls
+            for name in path.split("."):
+                relationship = sqlalchemy.inspect(owner).relationships.get(
+                    name)
+                if relationship is None:
+                    raise ValueError("{} has no relationship {}".format(
+                        owner.__name__, name))
+                attr = getattr(owner, name)
+                option = selectinload(attr) if option is None else \
+                    option.selectinload(attr)
+                owner = relationship.mapper.class_
+            options.append(option)
+        return options
+
+    def __search_query(self, states, cities, amenities, ranges):
+        """returns the query of the places matching the filters of
+        search_places"""
+        query = self.__session.query(Place)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(states), Place.city_id.in_(cities)))
+        if amenities:
+            from models.place import place_amenity
+            amenities = set(amenities)
+            linked = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count() == len(amenities))
+            query = query.filter(Place.id.in_(linked))
+        for attr, (low, high) in (ranges or {}).items():
+            column = getattr(Place, attr)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return query
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """
+        Inserts many new objects with one executemany statement per table
+        and __batch_size rows, instead of one statement per object
+
+        The rows are sent at once but only committed by save(). The objects
+        are not added to the session, storage.get() loads them back, and
+        their relationships (e.g. place.amenities) are not saved.
+
+        Args:
+            objs (iterable): the new objects
+        """
+        by_class = {}
+        for obj in objs:
+            by_class.setdefault(obj.__class__, []).append(obj)
+        order = {table: i for i, table in
+                 enumerate(Base.metadata.sorted_tables)}
+        for cls in sorted(by_class, key=lambda cls: order[cls.__table__]):
+            objs = by_class[cls]
+            name = cls.__name__
+            columns = sqlalchemy.inspect(cls).column_attrs.keys()
+            for start in range(0, len(objs), self.__batch_size):
+                batch = objs[start:start + self.__batch_size]
+                self.__session.execute(insert(cls), [
+                    {attr: getattr(obj, attr, None) for attr in columns}
+                    for obj in batch])
+            added = []
+            for obj in objs:
+                key = name + "." + obj.id
+                if name in TEXT_FIELDS:
+                    added.append((key, document_text(
+                        name, lambda attr: getattr(obj, attr, None))))
+                self.__session.info.setdefault("changed", set()).add(key)
+                for callback in self.__listeners:
+                    callback(key)
+            self.__index_text(self.__session.connection(), [], added)
+        if by_class:
+            self.__counts = None
+            self.__session.info["counted"] = False
+
+    def bulk_save(self, objs):
+        """
+        Inserts many new objects then commits them, instead of one commit
+        per object with BaseModel.save()
+
+        Args:
+            objs (iterable): the new objects, whose updated_at is set to now
+
+        Returns:
+            The list of the objects as stored, selected again by
+            __batch_size ids so the column defaults are set
+        """
+        now = datetime.utcnow()
+        objs = list(objs)
+        for obj in objs:
+            obj.updated_at = now
+        self.bulk_new(objs)
+        self.save()
+        by_class = {}
+        for obj in objs:
+            by_class.setdefault(obj.__class__, []).append(obj.id)
+        stored = {}
+        for cls, ids in by_class.items():
+            for start in range(0, len(ids), self.__batch_size):
+                for obj in self.__session.query(cls).filter(
+                        cls.id.in_(ids[start:start + self.__batch_size])):
+                    stored[(cls, obj.id)] = obj
+        return [stored[(obj.__class__, obj.id)] for obj in objs]
+
     def save(self):
         """commit all changes of the current database session"""
         self.__session.commit()
@@ -66,34 +605,157 @@ class DBStorage:
             self.save()
 
     def reload(self):
-        """reloads data from the database"""
+        """reloads data from the database
+
+        The full-text index is built when its tables are created, e.g. for
+        a database created before them.
+        """
+        indexed = sqlalchemy.inspect(self.__engine).has_table(
+            text_documents.name)
         Base.metadata.create_all(self.__engine)
+        self.create_indexes()
+        self.__add_versions()
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_transaction_end", self.__ended)
         Session = scoped_session(sess_factory)
         self.__session = Session
+        if not indexed:
+            self.__build_text()
+        self.__warm_up()
+
+    def __add_versions(self):
+        """adds the missing rows of class_versions, starting at 0"""
+        try:
+            with self.__engine.begin() as connection:
+                present = set(connection.scalars(
+                    select(class_versions.c.name)))
+                missing = [{"name": name, "version": 0} for name in classes
+                           if name not in present]
+                if missing:
+                    connection.execute(insert(class_versions), missing)
+        except sqlalchemy.exc.IntegrityError:
+            # another process added them meanwhile
+            pass
+
+    def create_indexes(self):
+        """
+        Creates the indexes the models declare but existing tables lack
+
+        create_all() only creates the indexes of the tables it creates, so
+        this migrates the databases created before an index was declared.
+        An index is skipped if one on the same leading columns exists,
+        such as the one MySQL creates for a foreign key.
+
+        Returns:
+            The list of the names of the created indexes
+        """
+        created = []
+        inspector = sqlalchemy.inspect(self.__engine)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = [tuple(index["column_names"])
+                        for index in inspector.get_indexes(table.name)]
+            existing.append(tuple(inspector.get_pk_constraint(
+                table.name)["constrained_columns"]))
+            for index in table.indexes:
+                columns = tuple(column.name for column in index.columns)
+                if any(found[:len(columns)] == columns
+                       for found in existing):
+                    continue
+                index.create(bind=self.__engine)
+                existing.append(columns)
+                created.append(index.name)
+        return created
+
+    def __warm_up(self):
+        """opens the connections of the pool, up to its size and to
+        HBNB_MYSQL_POOL_WARMUP, so requests do not wait for them"""
+        pool = self.__engine.pool
+        count = self.__warmup
+        if hasattr(pool, "size"):
+            count = min(count, pool.size())
+        connections = []
+        try:
+            for i in range(count):
+                connections.append(self.__engine.connect())
+        finally:
+            for connection in connections:
+                connection.close()
+
+    def pool_stats(self):
+        """
+        Returns the statistics of the connection pool
+
+        Returns:
+            A dictionary of the pool size, the number of connections
+            checked in (idle) and checked out (in use), and the overflow,
+            the number of connections beyond the size; a statistic the
+            pool does not keep is None
+        """
+        pool = self.__engine.pool
+        stats = {}
+        for name, method in (("size", "size"), ("checked_in", "checkedin"),
+                             ("checked_out", "checkedout"),
+                             ("overflow", "overflow")):
+            method = getattr(pool, method, None)
+            stats[name] = None if method is None else method()
+        return stats
 
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
+    def __class(self, cls):
+        """returns the mapped class matching cls, a class or a class name"""
+        if isinstance(cls, str):
+            return classes.get(cls)
+        if classes.get(getattr(cls, "__name__", None)) is cls:
+            return cls
+        return None
+
     def get(self, cls, id):
         """
         Retrieves one object
 
+        Objects already in the session are returned without a query.
+
         Args:
-            cls (object): Class
+            cls (object): Class or class name
             id (str): String representing the object ID
 
         Returns:
             The object based on the class and its ID, or None if not found
         """
-        for clss in classes:
-            if cls is classes[clss] or cls is clss:
-                obj = self.__session.query(
-                    classes[clss]
-                    ).filter_by(id=id).first()
-                return (obj)
-        return None
+        cls = self.__class(cls)
+        if cls is None or id is None:
+            return None
+        return self.__session.get(cls, id)
+
+    def existing_ids(self, cls, ids):
+        """
+        Finds which of many ids are those of stored objects
+
+        The ids are looked up __batch_size at a time, one query each.
+
+        Args:
+            cls (object): Class or class name
+            ids (iterable): the ids to look up
+
+        Returns:
+            The set of the ids of ids that an object of cls has
+        """
+        cls = self.__class(cls)
+        ids = list(ids)
+        found = set()
+        if cls is None:
+            return found
+        for start in range(0, len(ids), self.__batch_size):
+            found.update(self.__session.scalars(select(cls.id).where(
+                cls.id.in_(ids[start:start + self.__batch_size]))))
+        return found
 
     def count(self, cls=None):
         """
@@ -106,11 +768,30 @@ class DBStorage:
             The number of objects in storage matching the given class.
             If no class is passed, returns the count of all objects in storage.
         """
-        new_dict = {}
-        for clss in classes:
-            if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    key = obj.__class__.__name__ + '.' + obj.id
-                    new_dict[key] = obj
-        return len(new_dict)
+        if cls is not None:
+            cls = self.__class(cls)
+            if cls is None:
+                return 0
+            return self.counts()[cls.__name__]
+        return sum(self.counts().values())
+
+    def counts(self):
+        """
+        Counts the objects of every class with a single query
+
+        The counts are kept until a commit adds or deletes rows, or for
+        __counts_ttl seconds.
+
+        Returns:
+            The dictionary of the number of objects by class name
+        """
+        counts = self.__counts
+        if counts is None or time.monotonic() >= self.__counts_expiry:
+            names = list(classes)
+            row = self.__session.query(*[
+                select(func.count(classes[name].id)).scalar_subquery()
+                for name in names]).one()
+            counts = dict(zip(names, row))
+            self.__counts = counts
+            self.__counts_expiry = time.monotonic() + self.__counts_ttl
+        return dict(counts)
@@ -3,17 +3,28 @@
 Contains the FileStorage class
 """
 
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 import json
+import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.compact import RecordStore
+from models.engine.geo import nearest
+from models.engine.place_index import PlaceIndex
+from models.engine.text_index import TEXT_FIELDS, TextIndex, document_text
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import os
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# foreign keys kept in reverse indexes, by class name
+fk_attrs = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+            "Review": ("place_id", "user_id")}
 
 
 class FileStorage:
@@ -23,47 +34,616 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects bucketed by <class name>
+    __buckets = {}
+    # dictionary - objects by (<class name>, <foreign key>) then key value
+    __fk_index = {}
+    # string - path to the append-only journal of changes to the JSON file
+    __journal_path = "file.json.log"
+    # bool - append changed records to the journal instead of rewriting
+    __journal = os.getenv("HBNB_FS_JOURNAL") == "1"
+    # int - journal size (bytes) past which it is folded into the JSON file
+    __journal_limit = int(os.getenv("HBNB_FS_JOURNAL_LIMIT", 1 << 20))
+    # dictionary - objects changed since the last save by <class name>.id,
+    # None once deleted
+    __dirty = {}
+    # dictionary - (object, to_dict() output) by <class name>.id, dropped
+    # whenever the object changes
+    __dicts = {}
+    # bool - keep reloaded records raw until their object is looked up
+    __lazy = os.getenv("HBNB_FS_LAZY") == "1"
+    # bool - lazy mode keeping the raw records JSON encoded in RecordStores
+    __compact = os.getenv("HBNB_FS_COMPACT") == "1"
+    # dictionary - records not turned into objects yet, by <class name>
+    # then <class name>.id, in dictionaries or RecordStores
+    __raw = {}
+    # dictionary - sorted ids by <class name>, built on first iter_all()
+    __sorted = {}
+    # PlaceIndex - search indexes over the places
+    __places = PlaceIndex()
+    # TextIndex - full-text index over the places and reviews, saved next
+    # to the JSON file (path: __file_path + ".idx")
+    __text = TextIndex()
+    # bool - whether __text was loaded or built by reload()
+    __text_loaded = False
+    # list - functions called with the key of every new, changed or deleted
+    # object
+    __listeners = []
+    # dictionary - number of objects added, changed or deleted by class name
+    __versions = {}
+    # string - tells the versions of this process from those of another
+    # one, drawn again when reload() reads files another process changed
+    __boot = os.urandom(8).hex()
+    # tuple - stamps of the JSON file and of the journal as this process
+    # last read or wrote them, None before the first reload()
+    __seen = None
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects, or the bucket of cls
+
+        load is the load plan of DBStorage.all(), ignored here since the
+        relationships are read from the reverse indexes.
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            self.__hydrate(self.__name(cls))
+            return self.__bucket(cls)
+        for name in list(self.__raw):
+            self.__hydrate(name)
         return self.__objects
 
+    def __name(self, cls):
+        """returns the name of cls, which may already be a name"""
+        if not isinstance(cls, str):
+            return cls.__name__
+        return cls
+
+    def __bucket(self, cls):
+        """returns the bucket holding the objects of cls"""
+        return self.__buckets.setdefault(self.__name(cls), {})
+
+    def __hydrate(self, name, keys=None):
+        """turns the raw records of class name into objects
+
+        Args:
+            name (str): class name
+            keys (iterable): keys of the records to hydrate, all if None
+        """
+        records = self.__raw.get(name)
+        if not records:
+            return
+        for key in list(records) if keys is None else keys:
+            value = records.pop(key, None)
+            if value is not None:
+                obj = self.__build(value)
+                self.__put(key, obj)
+                self.__dicts[key] = (obj, value)
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            added = self.__objects.get(key) is not obj
+            self.__put(key, obj)
+            self.__mark_dirty(key, obj)
+            if added:
+                self.__index_text(key, lambda attr: getattr(obj, attr, None))
+            self.__notify(key)
+
+    def bulk_new(self, objs):
+        """sets in __objects every object of objs, an iterable"""
+        for obj in objs:
+            self.new(obj)
+
+    def bulk_save(self, objs):
+        """
+        Saves many new or changed objects with a single write of the JSON
+        file, instead of one per object with BaseModel.save()
+
+        Args:
+            objs (iterable): the objects, whose updated_at is set to now
+
+        Returns:
+            The list of the objects, as stored
+        """
+        now = datetime.utcnow()
+        objs = list(objs)
+        for obj in objs:
+            obj.updated_at = now
+            self.new(obj)
+        self.save()
+        return objs
+
+    def listen(self, callback):
+        """registers callback(key) to be called with the <class name>.id key
+        of every object added, changed or deleted, or with None once
+        reload() read files another process changed, anything having
+        possibly changed"""
+        self.__listeners.append(callback)
+
+    def __notify(self, key):
+        """counts a change of the object under key and calls the
+        listeners"""
+        name = key.partition(".")[0]
+        self.__versions[name] = self.__versions.get(name, 0) + 1
+        for callback in self.__listeners:
+            callback(key)
+
+    def pool_stats(self):
+        """returns the statistics of the connection pool of DBStorage,
+        an empty dictionary since files need no connection"""
+        return {}
+
+    def version(self, cls):
+        """returns a string that changes whenever an object of cls is added,
+        changed or deleted"""
+        name = self.__name(cls)
+        return "{}.{}".format(self.__boot, self.__versions.get(name, 0))
+
+    def __index_text(self, key, get):
+        """indexes the text of the object under key, if its class has any
+
+        Args:
+            key (str): <class name>.id of the object
+            get (function): returns an attribute of the object by name
+        """
+        name = key.partition(".")[0]
+        if name in TEXT_FIELDS:
+            self.__text.add(key, document_text(name, get))
+
+    def __mark_dirty(self, key, obj):
+        """records that the object under key must be serialized again"""
+        self.__dirty[key] = obj
+        self.__dicts.pop(key, None)
+
+    def __put(self, key, obj):
+        """stores obj under key, replacing any previous object or record"""
+        self.__raw.get(key.partition(".")[0], {}).pop(key, None)
+        self.__sort_add(key)
+        old = self.__objects.get(key)
+        if old is not None:
+            self.__unindex(key, old)
+        self.__objects[key] = obj
+        self.__bucket(obj.__class__)[key] = obj
+        self.__index(key, obj)
+
+    def __remove(self, key):
+        """drops the object or raw record stored under key, if any"""
+        self.__raw.get(key.partition(".")[0], {}).pop(key, None)
+        self.__sort_remove(key)
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            self.__unindex(key, obj)
+            self.__bucket(obj.__class__).pop(key, None)
+        self.__dicts.pop(key, None)
+
+    def __sort_add(self, key):
+        """adds the id of key to the sorted ids of its class, if built"""
+        name, _, id = key.partition(".")
+        ids = self.__sorted.get(name)
+        if ids is not None:
+            i = bisect_left(ids, id)
+            if i == len(ids) or ids[i] != id:
+                ids.insert(i, id)
+
+    def __sort_remove(self, key):
+        """removes the id of key from the sorted ids of its class, if built"""
+        name, _, id = key.partition(".")
+        ids = self.__sorted.get(name)
+        if ids is not None:
+            i = bisect_left(ids, id)
+            if i < len(ids) and ids[i] == id:
+                del ids[i]
+
+    def iter_all(self, cls, after_id=None, limit=None, load=None,
+                 **filters):
+        """
+        Iterates over the objects of a class in id order
+
+        Args:
+            cls (object): Class or class name
+            after_id (str): only yield objects with an id greater than it
+            limit (int): maximum number of objects to yield
+            load (list): load plan of DBStorage.iter_all(), ignored
+            filters: attribute values the objects must have, e.g.
+                state_id="..."; the first one should be a foreign key
+
+        Returns:
+            A generator of the objects
+        """
+        name = self.__name(cls)
+        ids = self.__sorted.get(name)
+        if filters:
+            attr, value = next(iter(filters.items()))
+            matches = self.all_by(name, attr, value).values()
+            ids = sorted(obj.id for obj in matches
+                         if all(getattr(obj, k, None) == v
+                                for k, v in filters.items()))
+        elif ids is None:
+            ids = sorted([key.partition(".")[2]
+                          for key in self.__bucket(name)] +
+                         [key.partition(".")[2]
+                          for key in self.__raw.get(name, ())])
+            self.__sorted[name] = ids
+        start = 0 if after_id is None else bisect_right(ids, after_id)
+        end = len(ids) if limit is None else start + limit
+        for id in ids[start:end]:
+            obj = self.get(name, id)
+            if obj is not None:
+                yield obj
+
+    def __index(self, key, obj, attrs=None):
+        """adds obj to the reverse indexes of its foreign keys"""
+        name = obj.__class__.__name__
+        if name == "Place" and attrs is None:
+            self.__places.add(key, obj)
+        for attr in attrs or fk_attrs.get(name, ()):
+            index = self.__fk_index.setdefault((name, attr), {})
+            index.setdefault(getattr(obj, attr, None), {})[key] = obj
+
+    def __unindex(self, key, obj, attr=None, value=None):
+        """removes obj from the reverse indexes of its foreign keys
+
+        If attr is given only that index is updated, value being the
+        foreign key obj is currently indexed under.
+        """
+        name = obj.__class__.__name__
+        if attr is None:
+            if name == "Place":
+                self.__places.remove(key)
+            fks = [(fk, getattr(obj, fk, None))
+                   for fk in fk_attrs.get(name, ())]
+        else:
+            fks = [(attr, value)]
+        for fk, fk_value in fks:
+            index = self.__fk_index.get((name, fk), {})
+            refs = index.get(fk_value)
+            if refs is not None:
+                refs.pop(key, None)
+                if not refs:
+                    del index[fk_value]
+
+    def changed(self, obj, attr, old=None):
+        """marks a stored obj dirty and updates its indexes after attr was set
+
+        Args:
+            obj (BaseModel): the object that was modified
+            attr (str): name of the attribute that was set
+            old: value of attr before it was set
+        """
+        id = getattr(obj, "id", None)
+        if id is None:
+            return
+        name = obj.__class__.__name__
+        key = name + "." + id
+        if self.__objects.get(key) is not obj:
+            return
+        self.__mark_dirty(key, obj)
+        if attr in fk_attrs.get(name, ()):
+            self.__unindex(key, obj, attr, old)
+            self.__index(key, obj, (attr,))
+        if name == "Place":
+            self.__places.add(key, obj)
+        if attr in TEXT_FIELDS.get(name, ()):
+            self.__index_text(key, lambda attr: getattr(obj, attr, None))
+        self.__notify(key)
+
+    def all_by(self, cls, attr, value):
+        """
+        Retrieves the objects of a class by the value of a foreign key
+
+        Args:
+            cls (object): Class or class name
+            attr (str): Name of the foreign key attribute, e.g. "state_id"
+            value (str): The id the foreign key must be equal to
+
+        Returns:
+            A dictionary of the matching objects by <class name>.id
+        """
+        cls = self.__name(cls)
+        self.__hydrate(cls)
+        if attr in fk_attrs.get(cls, ()):
+            return self.__fk_index.get((cls, attr), {}).get(value, {})
+        return {key: obj for key, obj in self.__bucket(cls).items()
+                if getattr(obj, attr, None) == value}
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      after_id=None, limit=None, ranges=None, sort=None,
+                      after_value=None):
+        """
+        Searches places through the indexes
+
+        Range filters and sort go through the sorted indexes of PlaceIndex,
+        built on their first use, so a sorted query with a limit stops
+        after `limit` matches instead of sorting every place.
+
+        Args:
+            states (list): ids of states whose places are wanted
+            cities (list): ids of cities whose places are wanted
+            amenities (list): ids of amenities every place must have
+            after_id (str): only return places with an id greater than it,
+                or after (after_value, after_id) in sort order
+            limit (int): maximum number of places to return
+            ranges (dict): (min, max) bounds by attribute of RANGE_ATTRS,
+                either bound may be None
+            sort (str): attribute of RANGE_ATTRS to order places by
+            after_value (float): value of sort the places start after
+
+        Returns:
+            A generator of the matching places in id order, or in (sort, id)
+            order. Places of every city are matched if no state nor city is
+            given.
+        """
+        self.__hydrate("Place")
+        keys = self.__search_keys(states, cities, amenities)
+        if ranges or sort:
+            if not self.__places.built():
+                self.__places.build(self.__bucket(Place))
+            if sort is not None:
+                after = None
+                if after_id is not None:
+                    after = (after_value, "Place." + after_id)
+                keys = self.__places.in_ranges(ranges or {}, keys, sort,
+                                               after, limit)
+                for key in keys:
+                    yield self.__objects[key]
+                return
+            keys = self.__places.in_ranges(ranges, keys)
+        if keys is None:
+            keys = self.__bucket(Place).keys()
+        ids = sorted(key.partition(".")[2] for key in keys)
+        start = 0 if after_id is None else bisect_right(ids, after_id)
+        end = len(ids) if limit is None else start + limit
+        for id in ids[start:end]:
+            yield self.get(Place, id)
+
+    def nearby_places(self, lat, lng, radius=None, limit=None, states=(),
+                      cities=(), amenities=(), ranges=None):
+        """
+        Searches the places nearest to a point through the grid of PlaceIndex
+
+        Args:
+            lat (float): latitude of the point, in degrees
+            lng (float): longitude of the point, in degrees
+            radius (float): largest distance of the places, in kilometers
+            limit (int): maximum number of places to return
+            states, cities, amenities, ranges: filters of search_places
+
+        Returns:
+            The list of matching places, nearest first
+        """
+        self.__hydrate("Place")
+        keys = self.__search_keys(states, cities, amenities)
+        if ranges:
+            if not self.__places.built():
+                self.__places.build(self.__bucket(Place))
+            keys = self.__places.in_ranges(ranges, keys)
+        pairs = nearest(lambda r: self.__places.within(lat, lng, r, keys),
+                        radius, limit)
+        return [self.__objects[key] for d, key in pairs]
+
+    def search_text(self, query, limit=None, classes=None):
+        """
+        Searches places and reviews by the words of their text
+
+        Args:
+            query (str): text of the query
+            limit (int): maximum number of objects to return
+            classes (list): names of the classes searched, all if None
+
+        Returns:
+            The list of matching objects, best BM25 score first
+        """
+        objs = []
+        for score, key in self.__text.search(query, limit, classes):
+            obj = self.get(*key.split(".", 1))
+            if obj is not None:
+                objs.append(obj)
+        return objs
+
+    def __search_keys(self, states, cities, amenities):
+        """returns the keys of the places matching the filters of
+        search_places, or None if every place matches"""
+        keys = None
+        if states or cities:
+            city_ids = set(cities)
+            for state_id in states:
+                city_ids.update(city.id for city in
+                                self.all_by(City, "state_id",
+                                            state_id).values())
+            keys = set()
+            for city_id in city_ids:
+                keys.update(self.all_by(Place, "city_id", city_id))
+        if amenities:
+            keys = self.__places.with_amenities(amenities, keys)
+        return keys
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
+        """serializes __objects to the JSON file (path: __file_path)
+
+        Only objects changed since the last call are serialized again, the
+        others reuse their cached dictionaries. In journal mode only the
+        changed objects are appended to the journal, which is compacted into
+        the JSON file once it grows past __journal_limit bytes.
+        """
+        if not self.__journal:
+            self.__dirty.clear()
+            self.__write_snapshot()
+            return
+        with open(self.__journal_path, 'a') as f:
+            for key, obj in self.__dirty.items():
+                value = self.__to_dict(key, obj) if obj is not None else None
+                f.write(json.dumps({"key": key, "value": value}) + "\n")
+        self.__dirty.clear()
+        FileStorage.__seen = self.__files_stamp()
+        if os.path.getsize(self.__journal_path) > self.__journal_limit:
+            self.compact()
+
+    def __write_snapshot(self):
+        """writes every object to the JSON file, then empties the journal
+
+        The snapshot holds every record of the journal, which reload()
+        would otherwise replay on top of newer values, e.g. those saved by
+        a process not in journal mode.
+        """
         json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
+        for records in self.__raw.values():
+            json_objects.update(records)
+        for key, obj in self.__objects.items():
+            json_objects[key] = self.__to_dict(key, obj)
+        tmp_path = self.__file_path + ".tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(json_objects, f)
+        os.replace(tmp_path, self.__file_path)
+        if self.__stamp(self.__journal_path)[0] > 0:
+            with open(self.__journal_path, 'w'):
+                pass
+        self.__text.write(self.__file_path + ".idx", self.__stamp())
+        FileStorage.__seen = self.__files_stamp()
+
+    def __stamp(self, path=None):
+        """returns the (size, modification time) of the JSON file, or of
+        the file at path"""
+        try:
+            stat = os.stat(path or self.__file_path)
+        except OSError:
+            return (-1, -1)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def __files_stamp(self):
+        """returns the stamps of the JSON file and of the journal"""
+        return (self.__stamp(), self.__stamp(self.__journal_path))
+
+    def __to_dict(self, key, obj):
+        """returns the cached dictionary of obj, serializing it if needed"""
+        cached = self.__dicts.get(key)
+        if cached is None or cached[0] is not obj:
+            cached = (obj, obj.to_dict())
+            self.__dicts[key] = cached
+        return cached[1]
+
+    def compact(self):
+        """folds the journal into the JSON file and empties the journal"""
+        self.__write_snapshot()
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file to __objects
+
+        The journal, if any, is replayed on top of the JSON file. In lazy
+        and compact modes records are only turned into objects when looked
+        up, compact mode keeping them JSON encoded meanwhile.
+        The first reload, and those after another process wrote the JSON
+        file, memory-map the full-text index saved with it, or rebuild it if
+        there is none or it is stale.
+        Objects whose record did not change are kept, with their place in
+        the sorted ids and place indexes, so a reload of files nobody else
+        wrote, with no unsaved change, does nothing.
+        If another process changed the files since they were last read or
+        written, every version() changes and the listeners are called with
+        None.
+        """
+        seen = self.__files_stamp()
+        if seen == self.__seen and not self.__dirty and self.__text_loaded:
+            return
+        foreign = self.__seen is not None and seen != self.__seen
+        if foreign:
+            FileStorage.__boot = os.urandom(8).hex()
+        text_current = self.__text_loaded and seen[0] == self.__seen[0]
+        FileStorage.__seen = seen
+        text_loaded = text_current or \
+            self.__text.load(self.__file_path + ".idx", self.__stamp())
+        records = {}
         try:
             with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+                records = json.load(f)
         except Exception as e:
             pass
+        journal = []
+        try:
+            with open(self.__journal_path, 'r') as f:
+                for line in f:
+                    record = json.loads(line)
+                    journal.append((record["key"], record["value"]))
+        except Exception as e:
+            pass
+        records.update(journal)
+        for key, value in records.items():
+            self.__load(key, value)
+        if not text_loaded:
+            self.__build_text()
+        else:
+            if not text_current:
+                # the loaded file lacks the changes not saved yet
+                for key, obj in self.__dirty.items():
+                    if obj is None:
+                        self.__text.remove(key)
+                    else:
+                        self.__index_text(
+                            key, lambda attr: getattr(obj, attr, None))
+            for key, value in journal:
+                if value is None:
+                    self.__text.remove(key)
+                else:
+                    self.__index_text(key, value.get)
+        FileStorage.__text_loaded = True
+        if foreign:
+            for callback in self.__listeners:
+                callback(None)
+
+    def __build_text(self):
+        """indexes the text of every object and record again"""
+        self.__text.clear()
+        for name in TEXT_FIELDS:
+            for key, obj in self.__bucket(name).items():
+                self.__index_text(key, lambda attr: getattr(obj, attr, None))
+            for key, record in self.__raw.get(name, {}).items():
+                self.__index_text(key, record.get)
+
+    def __load(self, key, value):
+        """stores the object described by value, or drops it if None"""
+        if key not in self.__dirty and self.__saved(key, value):
+            return
+        self.__dirty.pop(key, None)
+        if value is None:
+            self.__remove(key)
+        elif self.__lazy or self.__compact:
+            self.__remove(key)
+            name = key.partition(".")[0]
+            records = self.__raw.get(name)
+            if records is None:
+                records = RecordStore() if self.__compact else {}
+                self.__raw[name] = records
+            records[key] = value
+            self.__sort_add(key)
+        else:
+            obj = self.__build(value)
+            self.__put(key, obj)
+            self.__dicts[key] = (obj, value)
+
+    def __saved(self, key, value):
+        """tells whether value is the record of what is stored under key"""
+        if value is None:
+            return False
+        raw = self.__raw.get(key.partition(".")[0], {}).get(key)
+        if raw is not None:
+            return raw == value
+        cached = self.__dicts.get(key)
+        return cached is not None and \
+            cached[0] is self.__objects.get(key) and cached[1] == value
+
+    def __build(self, value):
+        """returns the object described by the record value"""
+        return classes[value["__class__"]](**value)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
+            self.__hydrate(obj.__class__.__name__, (key,))
             if key in self.__objects:
-                del self.__objects[key]
+                self.__remove(key)
+                self.__text.remove(key)
+                self.__dirty[key] = None
+                self.__notify(key)
                 self.save()
 
     def close(self):
@@ -75,17 +655,38 @@ class FileStorage:
         Retrieves one object
 
         Args:
-            cls (object): Class
+            cls (object): Class or class name
             id (str): String representing the object ID
 
         Returns:
             The object based on the class and its ID, or None if not found
         """
         if cls is not None:
-            obj = self.__objects.get(cls.__name__ + '.' + id)
+            cls = self.__name(cls)
+            key = cls + '.' + id
+            self.__hydrate(cls, (key,))
+            obj = self.__objects.get(key)
             return (obj)
         return None
 
+    def existing_ids(self, cls, ids):
+        """
+        Finds which of many ids are those of stored objects, without
+        turning raw records into objects
+
+        Args:
+            cls (object): Class or class name
+            ids (iterable): the ids to look up
+
+        Returns:
+            The set of the ids of ids that an object of cls has
+        """
+        name = self.__name(cls)
+        bucket = self.__bucket(name)
+        records = self.__raw.get(name, ())
+        return {id for id in ids
+                if name + "." + id in bucket or name + "." + id in records}
+
     def count(self, cls=None):
         """
         Count the number of objects in storage
@@ -98,9 +699,18 @@ class FileStorage:
             If no class is passed, returns the count of all objects in storage.
         """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return len(new_dict)
-        return len(self.__objects)
+            cls = self.__name(cls)
+            return len(self.__bucket(cls)) + len(self.__raw.get(cls, ()))
+        return len(self.__objects) + sum(map(len, self.__raw.values()))
+
+    def counts(self):
+        """
+        Counts the objects of every class
+
+        The buckets are kept by new(), delete() and reload(), so this is a
+        lookup per class.
+
+        Returns:
+            The dictionary of the number of objects by class name
+        """
+        return {name: self.count(name) for name in classes}
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Contains the distance and bounding box helpers of the nearby places queries
+"""
+
+from math import asin, cos, degrees, pi, radians, sin, sqrt
+from operator import itemgetter
+
+# mean radius of the Earth, in kilometers
+EARTH_RADIUS = 6371.0
+# largest distance between two points, in kilometers
+MAX_DISTANCE = pi * EARTH_RADIUS
+# radius, in kilometers, the k-nearest queries start searching within
+START_RADIUS = 10.0
+
+
+def valid_point(lat, lng):
+    """tells whether lat and lng are a latitude and longitude in degrees"""
+    return -90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0
+
+
+def distance(lat1, lng1, lat2, lng2):
+    """returns the great-circle distance between two points, in kilometers"""
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    a = sin((lat2 - lat1) / 2) ** 2 + \
+        cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+
+def bounding_box(lat, lng, radius):
+    """
+    Computes the box holding every point within radius of a point
+
+    Args:
+        lat (float): latitude of the center, in degrees
+        lng (float): longitude of the center, in degrees
+        radius (float): radius, in kilometers
+
+    Returns:
+        A tuple (lat_min, lat_max, lng_ranges), where lng_ranges is a list
+        of (lng_min, lng_max) ranges within [-180, 180], two of them if the
+        box crosses the antimeridian
+    """
+    angle = radius / EARTH_RADIUS
+    lat_min = degrees(radians(lat) - angle)
+    lat_max = degrees(radians(lat) + angle)
+    if lat_min <= -90.0 or lat_max >= 90.0 or angle >= pi / 2:
+        return max(lat_min, -90.0), min(lat_max, 90.0), [(-180.0, 180.0)]
+    delta = degrees(asin(min(1.0, sin(angle) / cos(radians(lat)))))
+    lng_min, lng_max = lng - delta, lng + delta
+    if lng_min < -180.0:
+        return lat_min, lat_max, [(lng_min + 360.0, 180.0),
+                                  (-180.0, lng_max)]
+    if lng_max > 180.0:
+        return lat_min, lat_max, [(lng_min, 180.0),
+                                  (-180.0, lng_max - 360.0)]
+    return lat_min, lat_max, [(lng_min, lng_max)]
+
+
+def nearest(within, radius=None, limit=None):
+    """
+    Finds the nearest items, searching within a growing radius until enough
+    of them are found
+
+    Args:
+        within (function): returns the list of (distance, item) pairs within
+            the radius it is given
+        radius (float): largest distance of the items, unbounded if None
+        limit (int): maximum number of items, every item within radius if
+            None
+
+    Returns:
+        The list of (distance, item) pairs, nearest first
+    """
+    end = MAX_DISTANCE if radius is None else min(radius, MAX_DISTANCE)
+    if limit is None:
+        pairs = within(end)
+    else:
+        search = min(START_RADIUS, end)
+        while True:
+            pairs = within(search)
+            if len(pairs) >= limit or search >= end:
+                break
+            search = min(search * 4, end)
+    pairs.sort(key=itemgetter(0))
+    return pairs if limit is None else pairs[:limit]
@@ -0,0 +1,256 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceIndex class
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from models.engine.geo import bounding_box, distance, valid_point
+
+# numeric attributes places can be filtered and sorted on
+RANGE_ATTRS = ("number_rooms", "number_bathrooms", "max_guest",
+               "price_by_night")
+# size of the cells of the latitude/longitude grid, in degrees
+CELL_SIZE = 0.1
+# number of rows and columns of the grid
+GRID_ROWS = int(round(180 / CELL_SIZE))
+GRID_COLUMNS = int(round(360 / CELL_SIZE))
+# greater than any place key, so that (value, MAX_KEY) follows every
+# (value, key) entry of the sorted indexes
+MAX_KEY = "\U0010ffff"
+
+
+def number(value):
+    """returns value as a float, or None if it is not a number"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def grid_row(lat):
+    """returns the row of the grid cells holding latitude lat"""
+    return min(int((lat + 90.0) // CELL_SIZE), GRID_ROWS - 1)
+
+
+def grid_column(lng):
+    """returns the column of the grid cells holding longitude lng"""
+    return min(int((lng + 180.0) // CELL_SIZE), GRID_COLUMNS - 1)
+
+
+class PlaceIndex:
+    """inverted indexes over the places kept by FileStorage"""
+
+    def __init__(self):
+        """Instantiate an empty PlaceIndex"""
+        # dictionary - sets of place keys by amenity id
+        self.__amenities = {}
+        # dictionary - amenity ids each place key is indexed under
+        self.__links = {}
+        # dictionary - sorted lists of (value, place key) by attribute of
+        # RANGE_ATTRS, None until build() is called
+        self.__sorted = None
+        # dictionary - values each place key is indexed under, by attribute
+        self.__values = {}
+        # dictionary - sets of place keys by (row, column) cell of the grid
+        self.__cells = {}
+        # dictionary - (latitude, longitude, cell) of each place key
+        self.__points = {}
+
+    def add(self, key, place):
+        """indexes place under key, replacing what was indexed under key"""
+        self.remove(key)
+        amenity_ids = tuple(place.amenity_ids)
+        for amenity_id in amenity_ids:
+            self.__amenities.setdefault(amenity_id, set()).add(key)
+        if amenity_ids:
+            self.__links[key] = amenity_ids
+        if self.__sorted is not None:
+            values = self.__numbers(place)
+            for attr, value in values.items():
+                insort(self.__sorted[attr], (value, key))
+            self.__values[key] = values
+        lat, lng = number(place.latitude), number(place.longitude)
+        if lat is not None and lng is not None and valid_point(lat, lng):
+            cell = (grid_row(lat), grid_column(lng))
+            self.__cells.setdefault(cell, set()).add(key)
+            self.__points[key] = (lat, lng, cell)
+
+    def remove(self, key):
+        """removes what was indexed under key"""
+        for amenity_id in self.__links.pop(key, ()):
+            keys = self.__amenities.get(amenity_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__amenities[amenity_id]
+        for attr, value in self.__values.pop(key, {}).items():
+            entries = self.__sorted[attr]
+            i = bisect_left(entries, (value, key))
+            if i < len(entries) and entries[i] == (value, key):
+                del entries[i]
+        point = self.__points.pop(key, None)
+        if point is not None:
+            keys = self.__cells[point[2]]
+            keys.discard(key)
+            if not keys:
+                del self.__cells[point[2]]
+
+    def __numbers(self, place):
+        """returns the numeric values of RANGE_ATTRS of place"""
+        values = {}
+        for attr in RANGE_ATTRS:
+            value = number(getattr(place, attr, None))
+            if value is not None:
+                values[attr] = value
+        return values
+
+    def unbuild(self):
+        """drops the sorted indexes, so add() stops maintaining them until
+        build() is called again"""
+        self.__sorted = None
+        self.__values = {}
+
+    def built(self):
+        """tells whether the sorted indexes have been built"""
+        return self.__sorted is not None
+
+    def build(self, places):
+        """
+        Builds the sorted indexes, which add() and remove() then maintain
+
+        Args:
+            places (dict): every place to index, by key
+        """
+        self.__sorted = {attr: [] for attr in RANGE_ATTRS}
+        self.__values = {}
+        for key, place in places.items():
+            values = self.__numbers(place)
+            for attr, value in values.items():
+                self.__sorted[attr].append((value, key))
+            self.__values[key] = values
+        for entries in self.__sorted.values():
+            entries.sort()
+
+    def in_ranges(self, ranges, keys=None, sort=None, after=None,
+                  limit=None):
+        """
+        Filters places by ranges of values, through the sorted indexes
+
+        Args:
+            ranges (dict): (min, max) bounds by attribute of RANGE_ATTRS,
+                either bound may be None
+            keys (set): place keys to filter, all indexed places if None
+            sort (str): attribute of RANGE_ATTRS to order the result by
+            after (tuple): (value, place key) the result starts after,
+                used with sort
+            limit (int): maximum number of keys returned, used with sort
+
+        Returns:
+            The list of the matching keys ordered by (sort, key), or the
+            set of the matching keys if sort is None
+        """
+        slices = {}
+        for attr in set(ranges) | ({sort} if sort else set()):
+            low, high = ranges.get(attr, (None, None))
+            entries = self.__sorted[attr]
+            start, end = 0, len(entries)
+            if low is not None:
+                start = bisect_left(entries, (low,))
+            if high is not None:
+                end = bisect_right(entries, (high, MAX_KEY))
+            slices[attr] = (start, end)
+
+        def matches(key):
+            """tells whether key is in keys and within every range"""
+            if keys is not None and key not in keys:
+                return False
+            values = self.__values[key]
+            for attr, (low, high) in ranges.items():
+                value = values.get(attr)
+                if value is None or (low is not None and value < low) or \
+                   (high is not None and value > high):
+                    return False
+            return True
+
+        if sort is not None:
+            entries = self.__sorted[sort]
+            start, end = slices[sort]
+            if after is not None:
+                start = max(start, bisect_right(entries, after))
+            result = []
+            for i in range(start, end):
+                if limit is not None and len(result) == limit:
+                    break
+                if matches(entries[i][1]):
+                    result.append(entries[i][1])
+            return result
+        attr = min(slices, key=lambda attr: slices[attr][1] - slices[attr][0])
+        start, end = slices[attr]
+        entries = self.__sorted[attr]
+        return {entries[i][1] for i in range(start, end)
+                if matches(entries[i][1])}
+
+    def with_amenities(self, amenity_ids, keys=None):
+        """
+        Filters places by amenities
+
+        Args:
+            amenity_ids (iterable): ids of the amenities a place must have
+            keys (set): place keys to filter, all indexed places if None
+
+        Returns:
+            The set of the place keys linked to every amenity
+        """
+        sets = sorted((self.__amenities.get(amenity_id, set())
+                       for amenity_id in set(amenity_ids)), key=len)
+        if keys is not None:
+            sets.append(keys)
+            sets.sort(key=len)
+        if not sets:
+            return set()
+        return sets[0].intersection(*sets[1:])
+
+    def within(self, lat, lng, radius, keys=None):
+        """
+        Finds the places within a distance of a point through the grid
+
+        Only the cells of the bounding box of the circle are looked at, or
+        the occupied cells if there are fewer of them, or the places of keys
+        if there are fewer of them.
+
+        Args:
+            lat (float): latitude of the point, in degrees
+            lng (float): longitude of the point, in degrees
+            radius (float): distance, in kilometers
+            keys (set): place keys to filter, all indexed places if None
+
+        Returns:
+            The list of (distance, key) pairs of the places within radius
+        """
+        lat_min, lat_max, lng_ranges = bounding_box(lat, lng, radius)
+        rows = range(grid_row(lat_min), grid_row(lat_max) + 1)
+        columns = [range(grid_column(low), grid_column(high) + 1)
+                   for low, high in lng_ranges]
+        size = min(len(rows) * sum(len(r) for r in columns),
+                   len(self.__cells))
+        if keys is not None and len(keys) < size:
+            candidates = (key for key in keys if key in self.__points)
+        else:
+            if size < len(self.__cells):
+                cells = ((row, column) for row in rows
+                         for r in columns for column in r)
+            else:
+                cells = (cell for cell in self.__cells if cell[0] in rows and
+                         any(cell[1] in r for r in columns))
+            candidates = (key for cell in cells
+                          for key in self.__cells.get(cell, ())
+                          if keys is None or key in keys)
+        pairs = []
+        for key in candidates:
+            point = self.__points[key]
+            d = distance(lat, lng, point[0], point[1])
+            if d <= radius:
+                pairs.append((d, key))
+        return pairs
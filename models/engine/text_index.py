@@ -0,0 +1,339 @@
+#!/usr/bin/python3
+"""
+Contains the TextIndex class, an inverted index ranking the places and
+reviews matching a text query with BM25
+"""
+
+from collections import Counter
+import heapq
+from math import log
+import mmap
+import os
+import re
+import struct
+
+# attributes whose text is indexed, by class name
+TEXT_FIELDS = {"Place": ("name", "description"), "Review": ("text",)}
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+# header of the index file: magic, stamp of the data the index matches,
+# number of documents, number of terms, total length of the documents, and
+# offsets of the documents, terms, postings and strings sections
+HEADER = struct.Struct("<8sqqIIQQQQQ")
+MAGIC = b"HBNBTXT1"
+# a document: offset and size of its key in the strings, length in tokens
+DOC = struct.Struct("<QII")
+# a term, sorted in the file: offset and size of the term in the strings,
+# offset and number of its postings
+TERM = struct.Struct("<QIQI")
+# a posting: document number, frequency of the term in the document
+POSTING = struct.Struct("<II")
+
+token_re = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """returns the lowercase words of text"""
+    return token_re.findall(text.lower())
+
+
+def document_text(name, get):
+    """
+    Returns the indexed text of an object
+
+    Args:
+        name (str): class name of the object
+        get (function): returns an attribute of the object by name
+    """
+    return " ".join(str(get(attr) or "") for attr in TEXT_FIELDS[name])
+
+
+def bm25(matches, size, average):
+    """
+    Scores the documents matching a term with BM25
+
+    Args:
+        matches (list): (document, frequency of the term in the document,
+            length of the document) of every document with the term
+        size (int): number of indexed documents
+        average (float): average length of the indexed documents
+
+    Returns:
+        An iterator of the (document, score) pairs
+    """
+    idf = log(1 + (size - len(matches) + 0.5) / (len(matches) + 0.5))
+    for doc, tf, length in matches:
+        yield doc, idf * tf * (K1 + 1) / (
+            tf + K1 * (1 - B + B * length / average))
+
+
+class TextIndex:
+    """
+    Posting lists by term, loaded from an index file by memory-mapping it
+
+    The documents added or removed since the file was loaded are kept in
+    memory on top of it, until write() folds them into a new file.
+    """
+
+    def __init__(self):
+        """Instantiate an empty TextIndex"""
+        # mmap - the loaded index file, None if there is none
+        self.__map = None
+        # string - path of the loaded index file
+        self.__path = None
+        # tuple - header of the loaded index file
+        self.__header = None
+        # dictionary - numbers of the documents of the file by key, built
+        # the first time a document of the file is removed
+        self.__numbers = None
+        # set - numbers of the documents of the file removed since
+        self.__removed = set()
+        # int - total length of the documents of the file removed since
+        self.__removed_length = 0
+        # dictionary - (length, term frequencies) of the documents added
+        # since the file was loaded, by key
+        self.__docs = {}
+        # dictionary - frequencies of each term by key in these documents
+        self.__postings = {}
+        # int - total length of these documents
+        self.__length = 0
+
+    def add(self, key, text):
+        """indexes text under key, replacing what was indexed under key"""
+        self.remove(key)
+        terms = Counter(tokenize(text))
+        if not terms:
+            return
+        length = sum(terms.values())
+        self.__docs[key] = (length, terms)
+        for term, tf in terms.items():
+            self.__postings.setdefault(term, {})[key] = tf
+        self.__length += length
+
+    def remove(self, key):
+        """removes what was indexed under key"""
+        doc = self.__docs.pop(key, None)
+        if doc is not None:
+            for term in doc[1]:
+                postings = self.__postings[term]
+                del postings[key]
+                if not postings:
+                    del self.__postings[term]
+            self.__length -= doc[0]
+        if self.__map is None:
+            return
+        if self.__numbers is None:
+            self.__numbers = {self.__key(number): number
+                              for number in range(self.__header[3])}
+        number = self.__numbers.get(key)
+        if number is not None and number not in self.__removed:
+            self.__removed.add(number)
+            self.__removed_length += self.__doc(number)[2]
+
+    def size(self):
+        """returns the number of indexed documents"""
+        size = len(self.__docs)
+        if self.__map is not None:
+            size += self.__header[3] - len(self.__removed)
+        return size
+
+    def search(self, query, limit=None, classes=None):
+        """
+        Ranks the documents matching any word of a query with BM25
+
+        Args:
+            query (str): text of the query
+            limit (int): maximum number of keys returned
+            classes (iterable): class names of the keys returned, any if
+                None
+
+        Returns:
+            The list of (score, key) pairs, best first then by key
+        """
+        size = self.size()
+        if not size:
+            return []
+        length = self.__length
+        if self.__map is not None:
+            length += self.__header[5] - self.__removed_length
+        average = length / size
+        prefixes = None if classes is None else \
+            tuple(name + "." for name in classes)
+        scores = {}
+        for term in set(tokenize(query)):
+            matches = [(key, tf, self.__docs[key][0]) for key, tf in
+                       self.__postings.get(term, {}).items()]
+            found = self.__find(term) if self.__map is not None else None
+            if found is not None:
+                start, count = found
+                for number, tf in POSTING.iter_unpack(
+                        self.__map[start:start + count * POSTING.size]):
+                    if number not in self.__removed:
+                        matches.append((number, tf, self.__doc(number)[2]))
+            for doc, score in bm25(matches, size, average):
+                scores[doc] = scores.get(doc, 0.0) + score
+        pairs = ((score, doc) for doc, score in scores.items())
+        if prefixes is not None:
+            pairs = ((score, doc if isinstance(doc, str) else self.__key(doc))
+                     for score, doc in pairs)
+            pairs = (pair for pair in pairs if pair[1].startswith(prefixes))
+        if limit is not None:
+            # the best limit pairs, and those tied with the last of them so
+            # that ties are broken by key below whatever the order of docs
+            pairs = list(pairs)
+            best = heapq.nlargest(limit, pairs, key=lambda pair: pair[0])
+            if best:
+                pairs = [pair for pair in pairs if pair[0] >= best[-1][0]]
+        pairs = sorted(((score, doc if isinstance(doc, str) else
+                         self.__key(doc)) for score, doc in pairs),
+                       key=lambda pair: (-pair[0], pair[1]))
+        return pairs if limit is None else pairs[:limit]
+
+    def __doc(self, number):
+        """returns the (key offset, key size, length) of a document of the
+        file"""
+        return DOC.unpack_from(self.__map, self.__header[6] +
+                               number * DOC.size)
+
+    def __key(self, number):
+        """returns the key of a document of the file"""
+        offset, size, length = self.__doc(number)
+        return self.__string(offset, size)
+
+    def __string(self, offset, size):
+        """returns a string of the strings section of the file"""
+        start = self.__header[9] + offset
+        return self.__map[start:start + size].decode()
+
+    def __term(self, number):
+        """returns the (term, postings offset, postings count) of a term of
+        the file"""
+        offset, size, start, count = TERM.unpack_from(
+            self.__map, self.__header[7] + number * TERM.size)
+        return self.__string(offset, size), self.__header[8] + start, count
+
+    def __find(self, term):
+        """returns the (postings offset, postings count) of a term of the
+        file, None if the file does not have it"""
+        low, high = 0, self.__header[4]
+        while low < high:
+            middle = (low + high) // 2
+            found, start, count = self.__term(middle)
+            if found == term:
+                return start, count
+            if found < term:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def load(self, path, stamp):
+        """
+        Memory-maps an index file, dropping what the index held
+
+        Args:
+            path (str): path of the index file
+            stamp (tuple): (size, modification time) of the data the file
+                must match
+
+        Returns:
+            True if the file was loaded, False if it is missing or stale
+        """
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(mapped) < HEADER.size or \
+           HEADER.unpack_from(mapped)[:3] != (MAGIC,) + tuple(stamp):
+            mapped.close()
+            return False
+        self.clear()
+        self.__map = mapped
+        self.__path = path
+        self.__header = HEADER.unpack_from(mapped)
+        return True
+
+    def clear(self):
+        """empties the index and unmaps its file"""
+        if self.__map is not None:
+            self.__map.close()
+        self.__init__()
+
+    def write(self, path, stamp):
+        """
+        Writes the index to a file, then memory-maps it
+
+        If nothing changed since the file at path was loaded only its stamp
+        is updated.
+
+        Args:
+            path (str): path of the index file
+            stamp (tuple): (size, modification time) of the data the file
+                matches
+        """
+        if self.__map is not None and self.__path == path and \
+           not self.__docs and not self.__removed:
+            with open(path, 'r+b') as f:
+                f.seek(len(MAGIC))
+                f.write(struct.pack("<qq", *stamp))
+            self.__header = HEADER.unpack_from(self.__map)
+            return
+        strings = bytearray()
+        docs = bytearray()
+        renumbered = {}
+        old = self.__header[3] if self.__map is not None else 0
+        for number in range(old):
+            if number not in self.__removed:
+                offset, size, length = self.__doc(number)
+                renumbered[number] = len(renumbered)
+                docs += DOC.pack(len(strings), size, length)
+                start = self.__header[9] + offset
+                strings += self.__map[start:start + size]
+        for key, (length, terms) in self.__docs.items():
+            renumbered[key] = len(renumbered)
+            encoded = key.encode()
+            docs += DOC.pack(len(strings), len(encoded), length)
+            strings += encoded
+        found_terms = {}
+        if self.__map is not None:
+            for number in range(self.__header[4]):
+                term, offset, size = self.__term(number)
+                found_terms[term] = (offset, size)
+        table = bytearray()
+        postings = bytearray()
+        count = 0
+        for term in sorted(found_terms.keys() | self.__postings.keys()):
+            start = len(postings)
+            found = found_terms.get(term)
+            if found is not None:
+                offset, size = found
+                for number, tf in POSTING.iter_unpack(
+                        self.__map[offset:offset + size * POSTING.size]):
+                    if number not in self.__removed:
+                        postings += POSTING.pack(renumbered[number], tf)
+            for key, tf in self.__postings.get(term, {}).items():
+                postings += POSTING.pack(renumbered[key], tf)
+            size = (len(postings) - start) // POSTING.size
+            if size:
+                encoded = term.encode()
+                table += TERM.pack(len(strings), len(encoded), start, size)
+                strings += encoded
+                count += 1
+        length = self.__length
+        if self.__map is not None:
+            length += self.__header[5] - self.__removed_length
+        docs_offset = HEADER.size
+        terms_offset = docs_offset + len(docs)
+        postings_offset = terms_offset + len(table)
+        strings_offset = postings_offset + len(postings)
+        header = HEADER.pack(MAGIC, stamp[0], stamp[1], len(renumbered),
+                             count, length, docs_offset, terms_offset,
+                             postings_offset, strings_offset)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            for section in (header, docs, table, postings, strings):
+                f.write(section)
+        os.replace(tmp_path, path)
+        self.load(path, stamp)
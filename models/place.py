@@ -4,7 +4,8 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
+from sqlalchemy import (Column, String, Integer, Float, ForeignKey, Index,
+                        Table)
 from sqlalchemy.orm import relationship
 
 if models.storage_t == 'db':
@@ -16,15 +17,29 @@ if models.storage_t == 'db':
                           Column('amenity_id', String(60),
                                  ForeignKey('amenities.id', onupdate='CASCADE',
                                             ondelete='CASCADE'),
-                                 primary_key=True))
+                                 primary_key=True),
+                          Index('ix_place_amenity_amenity_id', 'amenity_id'))
 
 
 class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
+        # the range filters and sorts of search_places() walk the
+        # (attribute, id) indexes, nearby_places() the bounding boxes of
+        # the (latitude, longitude) one; lookups by city_id use the
+        # (city_id, price_by_night) one
+        __table_args__ = (
+            Index('ix_places_city_id_price_by_night', 'city_id',
+                  'price_by_night'),
+            Index('ix_places_number_rooms_id', 'number_rooms', 'id'),
+            Index('ix_places_number_bathrooms_id', 'number_bathrooms', 'id'),
+            Index('ix_places_max_guest_id', 'max_guest', 'id'),
+            Index('ix_places_price_by_night_id', 'price_by_night', 'id'),
+            Index('ix_places_latitude_longitude', 'latitude', 'longitude'))
         city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
-        user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
+        user_id = Column(String(60), ForeignKey('users.id'), nullable=False,
+                         index=True)
         name = Column(String(128), nullable=False)
         description = Column(String(1024), nullable=True)
         number_rooms = Column(Integer, nullable=False, default=0)
@@ -59,20 +74,16 @@ class Place(BaseModel, Base):
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return list(models.storage.all_by(Review, "place_id",
+                                              self.id).values())
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
             amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
+            for amenity_id in self.amenity_ids:
+                amenity = models.storage.get(Amenity, amenity_id)
+                if amenity is not None:
                     amenity_list.append(amenity)
             return amenity_list
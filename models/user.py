@@ -13,7 +13,7 @@ class User(BaseModel, Base):
     """Representation of a user """
     if models.storage_t == 'db':
         __tablename__ = 'users'
-        email = Column(String(128), nullable=False)
+        email = Column(String(128), nullable=False, index=True)
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
         last_name = Column(String(128), nullable=True)
@@ -31,3 +31,18 @@ class User(BaseModel, Base):
         if password is not None:
             self.password = hashlib.md5(password.encode()).hexdigest()
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != 'db':
+        @property
+        def places(self):
+            """getter for list of place instances owned by the user"""
+            from models.place import Place
+            return list(models.storage.all_by(Place, "user_id",
+                                              self.id).values())
+
+        @property
+        def reviews(self):
+            """getter for list of review instances written by the user"""
+            from models.review import Review
+            return list(models.storage.all_by(Review, "user_id",
+                                              self.id).values())
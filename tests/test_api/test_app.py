@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""
+Contains the TestAppDocs and TestApp classes
+"""
+
+from api.v1 import app as app_module
+import models
+from models import storage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import tempfile
+import unittest
+app = app_module.app
+cache = app_module.cache
+# classes of the objects deleted after a db test, children first
+DELETE_ORDER = ("Review", "Place", "City", "User", "Amenity", "State")
+
+
+class TestAppDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the API app"""
+    def test_pep8_conformance_app(self):
+        """Test that api/v1/app.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/app.py',
+                                    'api/v1/views/pagination.py',
+                                    'tests/test_api/test_app.py',
+                                    'tests/test_api/test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_app_docstrings(self):
+        """Test for the presence of docstrings in the app module"""
+        self.assertIsNot(app_module.__doc__, None)
+        for name in ["current_etag", "conditional_get", "cached_response",
+                     "cache_response", "set_etag", "tee"]:
+            self.assertIsNot(getattr(app_module, name).__doc__, None,
+                             "{:s} needs a docstring".format(name))
+
+
+class AppTestCase(unittest.TestCase):
+    """Base of the API tests, with a state, a city, a user and two places
+    in an otherwise empty storage"""
+    def setUp(self):
+        """gives each test an empty storage, an empty cache and a state
+        with a city, a user and two places"""
+        if models.storage_t == "db":
+            keys = set()
+            storage.listen(keys.add)
+            self.addCleanup(self.delete, keys)
+        else:
+            from tests.test_models.test_engine.test_file_storage import \
+                isolated_storage
+            directory = tempfile.TemporaryDirectory()
+            self.addCleanup(directory.cleanup)
+            patch = isolated_storage(directory.name)
+            patch.start()
+            self.addCleanup(patch.stop)
+        if cache is not None:
+            cache.clear()
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.user = User(email="quokka@hbnb.io", password="pwd")
+        self.sf = Place(name="Quokka loft", city_id=self.city.id,
+                        user_id=self.user.id, latitude=37.77,
+                        longitude=-122.42)
+        self.oak = Place(name="Garden studio", city_id=self.city.id,
+                         user_id=self.user.id, latitude=37.80,
+                         longitude=-122.27)
+        for obj in [self.state, self.city, self.user, self.sf, self.oak]:
+            storage.new(obj)
+        storage.save()
+
+    def delete(self, keys):
+        """deletes the objects of keys from the database, then stops
+        listening to changes"""
+        storage._DBStorage__listeners.remove(keys.add)
+        storage.close()
+        for name in DELETE_ORDER:
+            for key in keys:
+                if key.startswith(name + "."):
+                    obj = storage.get(name, key.partition(".")[2])
+                    if obj is not None:
+                        obj.delete()
+        storage.close()
+
+    def cities_url(self):
+        """returns the URL of the cities of the state"""
+        return "/api/v1/states/{}/cities".format(self.state.id)
+
+
+class TestApp(AppTestCase):
+    """Test the streaming, caching and conditional GETs of the API, and its
+    search and bulk views"""
+    def test_etag(self):
+        """Test that a GET with the ETag of the response gets a 304 until
+        the response changes"""
+        for url in ["/api/v1/cities/" + self.city.id, self.cities_url()]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response.headers["ETag"]
+                response = self.client.get(
+                    url, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.headers["ETag"], etag)
+                self.client.put("/api/v1/cities/" + self.city.id,
+                                json={"name": "Renamed " + url})
+                response = self.client.get(
+                    url, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response.headers["ETag"], etag)
+
+    @unittest.skipIf(cache is None, "the response cache is disabled")
+    def test_cache(self):
+        """Test that GET responses are cached until their objects change"""
+        url = "/api/v1/cities/" + self.city.id
+        response = self.client.get(url)
+        self.assertEqual(len(cache), 1)
+        cached = self.client.get(url)
+        self.assertEqual(cached.get_data(), response.get_data())
+        self.assertEqual(cached.headers["ETag"], response.headers["ETag"])
+        self.client.put(url, json={"name": "Oakland"})
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(self.client.get(url).get_json()["name"], "Oakland")
+        self.client.post(self.cities_url(), json={"name": "Fremont"})
+        self.client.head(self.cities_url())
+        self.assertEqual(len(cache), 1)
+        names = [city["name"] for city in
+                 self.client.get(self.cities_url()).get_json()]
+        self.assertCountEqual(names, ["Oakland", "Fremont"])
+
+    def test_places_nearby(self):
+        """Test that places_nearby lists the nearest places first"""
+        response = self.client.get(
+            "/api/v1/places_nearby?lat=37.7&lng=-122.4&radius=50")
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         [self.sf.id, self.oak.id])
+        response = self.client.post(
+            "/api/v1/places_nearby?lat=37.7&lng=-122.27&limit=1",
+            json={"cities": [self.city.id]})
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         [self.oak.id])
+        for query in ["lat=37.7", "lat=37.7&lng=-122.4",
+                      "lat=91&lng=0&limit=1", "lat=37.7&lng=-122.4&radius=-1"]:
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/places_nearby?" + query)
+                self.assertEqual(response.status_code, 400)
+
+    def test_search(self):
+        """Test that search ranks places and reviews by their words"""
+        review = Review(text="the quokka loft was lovely",
+                        place_id=self.oak.id, user_id=self.user.id)
+        storage.new(review)
+        storage.save()
+        response = self.client.get("/api/v1/search?q=quokka+loft")
+        self.assertEqual([obj["id"] for obj in response.get_json()],
+                         [self.sf.id, review.id])
+        response = self.client.get("/api/v1/search?q=quokka&type=Review")
+        self.assertEqual([obj["id"] for obj in response.get_json()],
+                         [review.id])
+        for query in ["", "q=quokka&type=City", "q=quokka&limit=0"]:
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/search?" + query)
+                self.assertEqual(response.status_code, 400)
+
+    def test_bulk(self):
+        """Test that bulk creates every object or none"""
+        url = "/api/v1/cities/bulk"
+        response = self.client.post(url, json=[
+            {"state_id": self.state.id, "name": "Fremont", "id": "fremont"},
+            {"state_id": self.state.id, "name": "Oakland"}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([city["name"] for city in response.get_json()],
+                         ["Fremont", "Oakland"])
+        self.assertEqual(storage.get(City, "fremont").name, "Fremont")
+        for body, status in [
+                ({"name": "Reno"}, 400),
+                ([{"state_id": self.state.id}], 400),
+                ([{"state_id": "nowhere", "name": "Reno"}], 404),
+                ([{"state_id": self.state.id, "name": "Reno", "id": 1}], 400),
+                ([{"state_id": self.state.id, "name": "Reno", "id": "r"},
+                  {"state_id": self.state.id, "name": "Reno", "id": "r"}],
+                 400),
+                ([{"state_id": self.state.id, "name": "Reno",
+                   "id": "fremont"}], 400)]:
+            with self.subTest(body=body):
+                response = self.client.post(url, json=body)
+                self.assertEqual(response.status_code, status)
+        self.assertEqual(storage.count(City), 3)
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TestResponseCacheDocs and TestResponseCache classes
+"""
+
+from api.v1 import cache
+import inspect
+import pep8
+import unittest
+from unittest import mock
+ResponseCache = cache.ResponseCache
+
+
+class TestResponseCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ResponseCache class"""
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py',
+                                    'tests/test_api/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_docstrings(self):
+        """Test for the presence of docstrings in ResponseCache"""
+        self.assertIsNot(cache.__doc__, None)
+        self.assertIsNot(ResponseCache.__doc__, None)
+        for func in inspect.getmembers(ResponseCache, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class"""
+    def test_get_put(self):
+        """Test that put values are returned by get"""
+        responses = ResponseCache(2)
+        self.assertIsNone(responses.get("a"))
+        responses.put("a", "A", 60, ["State"], responses.generation())
+        self.assertEqual(responses.get("a"), "A")
+        self.assertEqual(len(responses), 1)
+
+    def test_ttl(self):
+        """Test that entries expire after their time to live"""
+        responses = ResponseCache(2)
+        with mock.patch.object(cache.time, "monotonic", return_value=100):
+            responses.put("a", "A", 10, [], responses.generation())
+        with mock.patch.object(cache.time, "monotonic", return_value=109):
+            self.assertEqual(responses.get("a"), "A")
+        with mock.patch.object(cache.time, "monotonic", return_value=110):
+            self.assertIsNone(responses.get("a"))
+        self.assertEqual(len(responses), 0)
+
+    def test_lru(self):
+        """Test that the least recently used entry is dropped first"""
+        responses = ResponseCache(2)
+        for key in ["a", "b"]:
+            responses.put(key, key.upper(), 60, [], responses.generation())
+        responses.get("a")
+        responses.put("c", "C", 60, [], responses.generation())
+        self.assertEqual(len(responses), 2)
+        self.assertIsNone(responses.get("b"))
+        self.assertEqual(responses.get("a"), "A")
+        self.assertEqual(responses.get("c"), "C")
+
+    def test_invalidate(self):
+        """Test that invalidate drops the entries depending on an object or
+        on its class"""
+        responses = ResponseCache(4)
+        generation = responses.generation()
+        responses.put("states", "S", 60, ["State"], generation)
+        responses.put("state1", "1", 60, ["State.1"], generation)
+        responses.put("state2", "2", 60, ["State.2"], generation)
+        responses.put("cities", "C", 60, ["City", "State.1"], generation)
+        responses.invalidate("State.1")
+        self.assertIsNone(responses.get("states"))
+        self.assertIsNone(responses.get("state1"))
+        self.assertIsNone(responses.get("cities"))
+        self.assertEqual(responses.get("state2"), "2")
+        responses.invalidate("City.1")
+        self.assertEqual(len(responses), 1)
+        responses.invalidate(None)
+        self.assertEqual(len(responses), 0)
+
+    def test_stale_put(self):
+        """Test that a value computed before an invalidation is not
+        cached"""
+        responses = ResponseCache(2)
+        generation = responses.generation()
+        responses.invalidate("State.1")
+        responses.put("states", "S", 60, ["State"], generation)
+        self.assertIsNone(responses.get("states"))
+        responses.put("states", "S", 60, ["State"], responses.generation())
+        self.assertEqual(responses.get("states"), "S")
+
+    def test_clear(self):
+        """Test that clear drops every entry and the values being
+        computed"""
+        responses = ResponseCache(2)
+        generation = responses.generation()
+        responses.put("a", "A", 60, ["State"], generation)
+        responses.clear()
+        self.assertEqual(len(responses), 0)
+        responses.put("a", "A", 60, ["State"], generation)
+        self.assertIsNone(responses.get("a"))
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Contains the TestPagination class
+"""
+
+import json
+from models import storage
+from models.city import City
+from tests.test_api.test_app import AppTestCase
+from unittest import mock
+from urllib.parse import urlparse
+
+
+class TestPagination(AppTestCase):
+    """Test the cursor-based pagination and streaming of the list views"""
+    def test_pagination(self):
+        """Test that cursors page through a list in id order"""
+        cities = [City(name="City{}".format(i), state_id=self.state.id)
+                  for i in range(4)]
+        for city in cities:
+            storage.new(city)
+        storage.save()
+        ids = []
+        url = self.cities_url() + "?limit=2"
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), 2)
+            ids.extend(city["id"] for city in page)
+            link = response.headers.get("Link")
+            url = None
+            if link is not None:
+                url = urlparse(link[1:link.index(">")])
+                url = url.path + "?" + url.query
+        self.assertEqual(ids, sorted(city.id for city in
+                                     cities + [self.city]))
+        for query in ["limit=0", "limit=two", "cursor=%21%21"]:
+            with self.subTest(query=query):
+                response = self.client.get(self.cities_url() + "?" + query)
+                self.assertEqual(response.status_code, 400)
+
+    def test_ndjson(self):
+        """Test that lists are streamed as newline delimited JSON if the
+        client asks for it"""
+        response = self.client.get(
+            self.cities_url(), headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines],
+                         [self.city.id])
+        response = self.client.get(self.cities_url())
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual([city["id"] for city in response.get_json()],
+                         [self.city.id])
+
+    def test_close_once(self):
+        """Test that the storage is closed once per request, after the body
+        of a streamed response is sent"""
+        for url, streamed in [(self.cities_url(), True),
+                              ("/api/v1/cities/" + self.city.id, False)]:
+            with self.subTest(url=url), \
+                 mock.patch.object(storage, "close",
+                                   wraps=storage.close) as close:
+                response = self.client.get(url)
+                self.assertEqual(close.call_count, 0 if streamed else 1)
+                response.get_data()
+                response.close()
+                self.assertEqual(close.call_count, 1)
@@ -4,9 +4,14 @@ Contains the class TestConsoleDocs
 """
 
 import console
+from io import StringIO
 import inspect
+import models
+from models.state import State
 import pep8
+import tempfile
 import unittest
+from unittest import mock
 HBNBCommand = console.HBNBCommand
 
 
@@ -39,3 +44,43 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsole(unittest.TestCase):
+    """Class for testing the commands of the console"""
+    def setUp(self):
+        """gives each file storage test an empty storage whose files are in
+        a temporary directory"""
+        if models.storage_t != "db":
+            from tests.test_models.test_engine.test_file_storage import \
+                isolated_storage
+            directory = tempfile.TemporaryDirectory()
+            self.addCleanup(directory.cleanup)
+            patch = isolated_storage(directory.name)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def run_command(self, line):
+        """returns the output of a command of the console"""
+        with mock.patch("sys.stdout", new_callable=StringIO) as out:
+            HBNBCommand().onecmd(line)
+        return out.getvalue()
+
+    def test_show_update_destroy_get_one_object(self):
+        """Test that show, update and destroy look up the object by id
+        rather than listing every object"""
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        with mock.patch.object(models.storage, "all",
+                               side_effect=AssertionError("all() called")):
+            self.assertIn("California",
+                          self.run_command("show State " + state.id))
+            self.run_command('update State {} name "Nevada"'.format(
+                state.id))
+            self.assertEqual(models.storage.get(State, state.id).name,
+                             "Nevada")
+            self.assertEqual(self.run_command("show State missing"),
+                             "** no instance found **\n")
+            self.run_command("destroy State " + state.id)
+        self.assertIsNone(models.storage.get(State, state.id))
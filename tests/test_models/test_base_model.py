@@ -138,6 +138,44 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_to_dict_cache(self):
+        """Test that to_dict is cached until an attribute is set or deleted,
+        callers getting copies of it"""
+        bm = BaseModel()
+        d = bm.to_dict()
+        cached = bm._BaseModel__cache[False]
+        d["name"] = "Modified"
+        self.assertIs(bm._BaseModel__cache[False], cached)
+        self.assertNotIn("name", bm.to_dict())
+        self.assertNotIn("_BaseModel__cache", bm.__dict__)
+        bm.name = "Holberton"
+        self.assertEqual(bm.to_dict()["name"], "Holberton")
+        with mock.patch.object(models.storage, "changed") as changed:
+            del bm.name
+        changed.assert_called_once_with(bm, "name", "Holberton")
+        self.assertNotIn("name", bm.to_dict())
+
+    def test_parse_and_format_time(self):
+        """Test the timestamp helpers match strptime and strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        parse_time = models.base_model.parse_time
+        format_time = models.base_model.format_time
+        for stamp in ["2017-06-14T22:31:03.285259",
+                      "2017-06-14T22:31:03.000000"]:
+            with self.subTest(stamp=stamp):
+                value = parse_time(stamp)
+                self.assertEqual(value, datetime.strptime(stamp, t_format))
+                self.assertEqual(format_time(value), stamp)
+        for stamp in ["2017-06-14", "2017-06-14 22:31:03.285259",
+                      "2017-W24-3T22:31:03.285259",
+                      "2017-06-14T22:31:03.28525Z",
+                      "2017-06-14T22:31:03.2852+1",
+                      "2017-06-14T22:31:03+00:00"]:
+            with self.subTest(stamp=stamp):
+                with self.assertRaises(ValueError):
+                    parse_time(stamp)
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
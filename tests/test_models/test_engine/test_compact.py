@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompactDocs and TestRecordStore classes
+"""
+
+import inspect
+from models.engine import compact
+from models.place import Place
+import pep8
+import unittest
+RecordStore = compact.RecordStore
+
+
+class TestCompactDocs(unittest.TestCase):
+    """Tests to check the documentation and style of compact.py"""
+    def test_pep8_conformance_compact(self):
+        """Test that models/engine/compact.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/compact.py',
+                                    'tests/test_models/test_engine/\
+test_compact.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compact_module_docstring(self):
+        """Test for the compact.py module docstring"""
+        self.assertIsNot(compact.__doc__, None,
+                         "compact.py needs a docstring")
+        self.assertTrue(len(compact.__doc__) >= 1,
+                        "compact.py needs a docstring")
+
+    def test_compact_func_docstrings(self):
+        """Test for the presence of docstrings in compact.py functions"""
+        for func in inspect.getmembers(compact, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+    def test_record_store_docstrings(self):
+        """Test for the presence of docstrings in RecordStore methods"""
+        self.assertIsNot(RecordStore.__doc__, None)
+        for name, func in vars(RecordStore).items():
+            if not inspect.isfunction(func):
+                continue
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+
+
+class TestRecordStore(unittest.TestCase):
+    """Test the RecordStore class"""
+    def test_mapping(self):
+        """Test that records read back equal to what was stored"""
+        place = Place(name="Caf\u00e9 loft", number_rooms=2,
+                      amenity_ids=["a", "b"]).to_dict()
+        key = "Place." + place["id"]
+        records = RecordStore([(key, place)])
+        self.assertEqual(len(records), 1)
+        self.assertIn(key, records)
+        self.assertEqual(records[key], place)
+        self.assertIsNot(records[key], records[key])
+        self.assertEqual(dict(records), {key: place})
+        self.assertIsNone(records.get("Place.missing"))
+        self.assertEqual(records.pop(key), place)
+        self.assertEqual(len(records), 0)
+        self.assertNotIn(key, records)
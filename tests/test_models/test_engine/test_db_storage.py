@@ -3,6 +3,7 @@
 Contains the TestDBStorageDocs and TestDBStorage classes
 """
 
+from contextlib import contextmanager
 from datetime import datetime
 import inspect
 import models
@@ -17,12 +18,32 @@ from models.user import User
 import json
 import os
 import pep8
+from sqlalchemy import event
+import tempfile
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
 
 
+@contextmanager
+def recorded_statements():
+    """records in a list the statements sent to the database of the storage
+    within the with block"""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        """records a statement"""
+        statements.append(statement)
+    engine = models.storage._DBStorage__engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
 class TestDBStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of DBStorage class"""
     @classmethod
@@ -86,3 +107,382 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count(self):
+        """Test that count matches the rows returned by all"""
+        state = State(name="California")
+        state.save()
+        self.assertEqual(models.storage.count(State),
+                         len(models.storage.all(State)))
+        self.assertEqual(models.storage.count("State"),
+                         models.storage.count(State))
+        self.assertEqual(models.storage.count(), len(models.storage.all()))
+        state.delete()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get(self):
+        """Test that get finds objects by class or class name"""
+        state = State(name="California")
+        state.save()
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertIs(models.storage.get("State", state.id), state)
+        self.assertIsNone(models.storage.get(City, state.id))
+        self.assertIsNone(models.storage.get("Nope", state.id))
+        state.delete()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_iter_all(self):
+        """Test that iter_all pages through a class in id order"""
+        amenities = [Amenity(name=str(i)) for i in range(5)]
+        for amenity in amenities:
+            amenity.save()
+        ids = sorted(a.id for a in models.storage.all(Amenity).values())
+        self.assertEqual([a.id for a in models.storage.iter_all(Amenity)],
+                         ids)
+        page = models.storage.iter_all("Amenity", after_id=ids[1], limit=2)
+        self.assertEqual([a.id for a in page], ids[2:4])
+        for amenity in amenities:
+            amenity.delete()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_listen(self):
+        """Test that listeners get the keys of flushed then committed
+        objects"""
+        keys = []
+        listeners = models.storage._DBStorage__listeners
+        models.storage.listen(keys.append)
+        try:
+            state = State(name="California")
+            state.save()
+            state.name = "Nevada"
+            state.save()
+            state.delete()
+        finally:
+            listeners.remove(keys.append)
+        self.assertEqual(keys, ["State." + state.id] * 6)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version(self):
+        """Test that the version of a class changes with its rows, whichever
+        storage wrote them, and only then"""
+        version = models.storage.version
+        versions = [version(State)]
+        city_version = version("City")
+        state = State(name="California")
+        state.save()
+        versions.append(version("State"))
+        state.name = "Nevada"
+        state.save()
+        versions.append(version(State))
+        other = DBStorage.__new__(DBStorage)
+        other._DBStorage__engine = models.storage._DBStorage__engine
+        other._DBStorage__warmup = 0
+        other.reload()
+        other.delete(other.get(State, state.id))
+        other.close()
+        models.storage.close()
+        versions.append(version(State))
+        for before, after in zip(versions, versions[1:]):
+            self.assertNotEqual(before, after)
+        with mock.patch("time.time", return_value=1e12):
+            self.assertEqual(version(State), versions[-1])
+            self.assertEqual(version(City), city_version)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts are read once until rows are added"""
+        counts = models.storage.counts()
+        with recorded_statements() as statements:
+            self.assertEqual(models.storage.counts(), counts)
+            self.assertEqual(models.storage.count(State), counts["State"])
+        self.assertEqual(statements, [])
+        state = State(name="California")
+        state.save()
+        self.assertEqual(models.storage.counts()["State"],
+                         counts["State"] + 1)
+        state.delete()
+        self.assertEqual(models.storage.counts(), counts)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts_rollback(self):
+        """Test that counts read before a rollback or a close are read
+        again"""
+        session = models.storage._DBStorage__session
+        counts = models.storage.counts()
+        for end in [session.rollback, models.storage.close]:
+            with self.subTest(end=end):
+                session.add(State(name="California"))
+                session.flush()
+                self.assertEqual(models.storage.counts()["State"],
+                                 counts["State"] + 1)
+                end()
+                self.assertEqual(models.storage.counts(), counts)
+
+    def test_pool_configuration(self):
+        """Test that the pool is configured by the environment"""
+        env = {"HBNB_MYSQL_POOL_SIZE": "8", "HBNB_MYSQL_MAX_OVERFLOW": "2",
+               "HBNB_MYSQL_POOL_RECYCLE": "60",
+               "HBNB_MYSQL_POOL_PRE_PING": "0", "HBNB_ENV": ""}
+        with mock.patch.dict(os.environ, env), \
+                mock.patch.object(db_storage, "create_engine") as create:
+            os.environ.pop("HBNB_DB_URL", None)
+            DBStorage()
+        kwargs = create.call_args[1]
+        self.assertEqual(kwargs["pool_size"], 8)
+        self.assertEqual(kwargs["max_overflow"], 2)
+        self.assertEqual(kwargs["pool_timeout"], 30)
+        self.assertEqual(kwargs["pool_recycle"], 60)
+        self.assertFalse(kwargs["pool_pre_ping"])
+
+    def test_sqlite_url(self):
+        """Test that HBNB_DB_URL selects a SQLite database with pragmas"""
+        with tempfile.TemporaryDirectory() as directory:
+            for url, journal in (("sqlite://", "memory"),
+                                 ("sqlite:///" + os.path.join(
+                                     directory, "hbnb.db"), "wal")):
+                env = {"HBNB_DB_URL": url, "HBNB_ENV": ""}
+                with mock.patch.dict(os.environ, env):
+                    engine = DBStorage()._DBStorage__engine
+                with engine.connect() as connection:
+                    pragma = connection.exec_driver_sql
+                    self.assertEqual(
+                        pragma("PRAGMA journal_mode").scalar(), journal)
+                    self.assertEqual(
+                        pragma("PRAGMA foreign_keys").scalar(), 1)
+                    self.assertEqual(
+                        pragma("PRAGMA synchronous").scalar(), 1)
+                engine.dispose()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_save(self):
+        """Test that bulk_save inserts each table with one statement"""
+        keys = []
+        models.storage.listen(keys.append)
+        states = [State(name="State{}".format(i)) for i in range(5)]
+        cities = [City(name="City", state_id=state.id) for state in states]
+        counts = models.storage.counts()
+        try:
+            with recorded_statements() as statements:
+                stored = models.storage.bulk_save(cities + states)
+        finally:
+            models.storage._DBStorage__listeners.remove(keys.append)
+        inserts = [statement for statement in statements
+                   if statement.startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        self.assertIn("states", inserts[0])
+        self.assertEqual([obj.id for obj in stored],
+                         [obj.id for obj in cities + states])
+        self.assertEqual(stored[0].name, "City")
+        self.assertEqual(len(keys), 20)
+        self.assertEqual(len(set(keys)), 10)
+        self.assertEqual(models.storage.counts()["City"], counts["City"] + 5)
+        models.storage.close()
+        state = models.storage.get(State, states[0].id)
+        self.assertEqual([city.id for city in state.cities], [cities[0].id])
+        for state in states:
+            models.storage.get(State, state.id).delete()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_existing_ids(self):
+        """Test that existing_ids looks ids up with one query per batch"""
+        states = models.storage.bulk_save(State(name="State{}".format(i))
+                                          for i in range(3))
+        ids = [state.id for state in states] + ["missing1", "missing2"]
+        try:
+            with mock.patch.object(DBStorage, "_DBStorage__batch_size", 2), \
+                    recorded_statements() as statements:
+                found = models.storage.existing_ids(State, ids)
+            self.assertEqual(found, {state.id for state in states})
+            self.assertEqual(len(statements), 3)
+            self.assertEqual(models.storage.existing_ids("Nowhere", ids),
+                             set())
+        finally:
+            for state in states:
+                models.storage.delete(state)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_create_indexes(self):
+        """Test that create_indexes creates the missing declared indexes"""
+        import sqlalchemy
+        engine = models.storage._DBStorage__engine
+        self.assertEqual(models.storage.create_indexes(), [])
+        names = {index["name"] for index in
+                 sqlalchemy.inspect(engine).get_indexes("places")}
+        self.assertTrue({"ix_places_city_id_price_by_night",
+                         "ix_places_user_id", "ix_places_number_rooms_id",
+                         "ix_places_number_bathrooms_id",
+                         "ix_places_price_by_night_id"} <= names)
+        self.assertNotIn("ix_places_city_id", names)
+        index = next(index for index in Place.__table__.indexes
+                     if index.name == "ix_places_price_by_night_id")
+        index.drop(bind=engine)
+        self.assertEqual(models.storage.create_indexes(),
+                         ["ix_places_price_by_night_id"])
+        self.assertEqual(models.storage.create_indexes(), [])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats reports the pool and reload warms it up"""
+        stats = models.storage.pool_stats()
+        self.assertEqual(set(stats),
+                         {"size", "checked_in", "checked_out", "overflow"})
+        engine = models.storage._DBStorage__engine
+        connections = []
+
+        def checkout(*args):
+            """counts the connections checked out of the pool"""
+            connections.append(args)
+        with mock.patch.object(models.storage, "_DBStorage__warmup", 2):
+            event.listen(engine, "checkout", checkout)
+            try:
+                models.storage.reload()
+            finally:
+                event.remove(engine, "checkout", checkout)
+        self.assertGreaterEqual(len(connections), min(2, stats["size"] or 2))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_load(self):
+        """Test that a load plan loads relationships in one query each"""
+        states = []
+        for i in range(3):
+            state = State(name="State{}".format(i))
+            state.save()
+            states.append(state)
+            for j in range(2):
+                City(name="City{}".format(j), state_id=state.id).save()
+        models.storage.close()
+        try:
+            with recorded_statements() as statements:
+                loaded = models.storage.all(State, load=["cities.places"])
+                for state in loaded.values():
+                    for city in state.cities:
+                        city.places
+            self.assertEqual(len(statements), 3)
+            for state in states:
+                key = "State." + state.id
+                self.assertEqual(len(loaded[key].cities), 2)
+                self.assertNotIn("cities", loaded[key].to_dict())
+        finally:
+            for state in states:
+                models.storage.get(State, state.id).delete()
+        with self.assertRaises(ValueError):
+            models.storage.all(State, load=["places"])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_cities_by_states_queries(self):
+        """Test that /cities_by_states sends the same number of queries
+        whatever the number of states"""
+        import importlib
+        app = importlib.import_module("web_flask.8-cities_by_states").app
+        counts = []
+        states = []
+        for size in (1, 5):
+            while len(states) < size:
+                state = State(name="State{}".format(len(states)))
+                state.save()
+                City(name="City", state_id=state.id).save()
+                states.append(state)
+            with recorded_statements() as statements, \
+                    app.test_client() as client:
+                response = client.get('/cities_by_states')
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(statements))
+        for state in states:
+            models.storage.get(State, state.id).delete()
+        self.assertEqual(counts[0], counts[1])
+        self.assertLessEqual(counts[1], 2)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_places(self):
+        """Test that search_places combines states, cities and amenities"""
+        state = State(name="California")
+        state.save()
+        city = City(name="Fremont", state_id=state.id)
+        city.save()
+        user = User(email="a@b.c", password="pwd")
+        user.save()
+        amenity = Amenity(name="Wifi")
+        amenity.save()
+        place = Place(city_id=city.id, user_id=user.id, name="Loft")
+        place.amenities.append(amenity)
+        place.save()
+        self.assertTrue(inspect.isgenerator(models.storage.search_places()))
+
+        def search(**kwargs):
+            """returns the list of the places search_places yields"""
+            return list(models.storage.search_places(**kwargs))
+        self.assertEqual(search(states=[state.id]), [place])
+        self.assertEqual(search(cities=[city.id], amenities=[amenity.id]),
+                         [place])
+        self.assertEqual(search(amenities=[amenity.id, "nope"]), [])
+        self.assertEqual(search(ranges={"price_by_night": (1, None)}), [])
+        self.assertEqual(search(sort="price_by_night", after_id=place.id,
+                                after_value=0), [])
+        self.assertEqual(search(states=[state.id], sort="price_by_night",
+                                ranges={"max_guest": (0, 0)}), [place])
+        place.latitude, place.longitude = 37.77, -122.42
+        place.save()
+        nearby = models.storage.nearby_places
+        self.assertEqual(nearby(37.7, -122.4, limit=1), [place])
+        self.assertEqual(nearby(37.7, -122.4, radius=1), [])
+        self.assertEqual(nearby(37.7, -122.4, radius=10, states=[state.id]),
+                         [place])
+        search_text = models.storage.search_text
+        self.assertEqual(search_text("loft"), [place])
+        place.description = "zanzibar waterfront"
+        place.save()
+        self.assertEqual(search_text("zanzibar", classes=["Place"]),
+                         [place])
+        self.assertEqual(search_text("zanzibar", classes=["Review"]), [])
+        for obj in [place, amenity, user, city, state]:
+            obj.delete()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_text_terms_binary(self):
+        """Test that terms differing only by accents are distinct keys"""
+        from sqlalchemy.dialects import mysql
+        from sqlalchemy.schema import CreateTable
+        ddl = str(CreateTable(db_storage.text_postings).compile(
+            dialect=mysql.dialect()))
+        self.assertIn("COLLATE utf8mb4_bin", ddl)
+        session = models.storage._DBStorage__session
+        connection = session.connection()
+        try:
+            models.storage._DBStorage__index_text(
+                connection, [], [("Place.accents", "Caf\u00e9 cafe")])
+            postings = db_storage.text_postings
+            terms = connection.execute(
+                postings.select().where(
+                    postings.c.document == "Place.accents")).all()
+            self.assertCountEqual([row.term for row in terms],
+                                  ["caf\u00e9", "cafe"])
+        finally:
+            session.rollback()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_text_other_process(self):
+        """Test that search_text finds what another storage committed"""
+        other = DBStorage.__new__(DBStorage)
+        other._DBStorage__engine = models.storage._DBStorage__engine
+        other._DBStorage__warmup = 0
+        other.reload()
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        user = User(email="text@hbnb.io", password="pwd")
+        place = Place(name="Quokka lodge", city_id=city.id, user_id=user.id)
+        for obj in [state, city, user, place]:
+            other.new(obj)
+        other.save()
+        search_text = models.storage.search_text
+        self.assertEqual([obj.id for obj in search_text("quokka")],
+                         [place.id])
+        place.name = "Wombat lodge"
+        other.save()
+        self.assertEqual(search_text("quokka"), [])
+        self.assertEqual([obj.id for obj in search_text("wombat")],
+                         [place.id])
+        for obj in [place, user, city, state]:
+            other.delete(obj)
+        self.assertEqual(search_text("wombat lodge"), [])
+        other.close()
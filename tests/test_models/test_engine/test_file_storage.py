@@ -7,6 +7,9 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.compact import RecordStore
+from models.engine.place_index import PlaceIndex
+from models.engine.text_index import TextIndex, document_text
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,12 +20,34 @@ from models.user import User
 import json
 import os
 import pep8
+import tempfile
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def isolated_storage(directory):
+    """
+    Returns a patch of the class attributes holding the FileStorage state,
+    emptying it and moving its files to a directory
+
+    Args:
+        directory (str): directory of file.json and of its journal
+    """
+    return mock.patch.multiple(
+        FileStorage, _FileStorage__objects={}, _FileStorage__buckets={},
+        _FileStorage__fk_index={}, _FileStorage__dirty={},
+        _FileStorage__dicts={}, _FileStorage__raw={}, _FileStorage__sorted={},
+        _FileStorage__places=PlaceIndex(), _FileStorage__text=TextIndex(),
+        _FileStorage__text_loaded=False, _FileStorage__versions={},
+        _FileStorage__seen=None,
+        _FileStorage__boot=FileStorage._FileStorage__boot,
+        _FileStorage__file_path=os.path.join(directory, "file.json"),
+        _FileStorage__journal_path=os.path.join(directory, "file.json.log"))
+
+
 class TestFileStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of FileStorage class"""
     @classmethod
@@ -70,6 +95,25 @@ test_file_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    def setUp(self):
+        """gives each test an empty storage whose files are in a temporary
+        directory"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "file.json")
+        patch = isolated_storage(self.directory)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.addCleanup(lambda: FileStorage._FileStorage__text.clear())
+
+    def forget(self):
+        """drops the objects, as a new process would not have them, so the
+        next reload() reads the files again"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__seen = None
+        FileStorage._FileStorage__text_loaded = False
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
         """Test that all returns the FileStorage.__objects attr"""
@@ -78,12 +122,22 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(type(new_dict), dict)
         self.assertIs(new_dict, storage._FileStorage__objects)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_load(self):
+        """Test that all ignores the load plan of DBStorage"""
+        storage = FileStorage()
+        self.assertIs(storage.all("State", load=["cities"]),
+                      storage.all("State"))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_pool_stats(self):
+        """Test that pool_stats has no connection pool to report"""
+        self.assertEqual(FileStorage().pool_stats(), {})
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_new(self):
         """test that new adds an object to the FileStorage.__objects attr"""
         storage = FileStorage()
-        save = FileStorage._FileStorage__objects
-        FileStorage._FileStorage__objects = {}
         test_dict = {}
         for key, value in classes.items():
             with self.subTest(key=key, value=value):
@@ -92,7 +146,6 @@ class TestFileStorage(unittest.TestCase):
                 storage.new(instance)
                 test_dict[instance_key] = instance
                 self.assertEqual(test_dict, storage._FileStorage__objects)
-        FileStorage._FileStorage__objects = save
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_save(self):
@@ -103,13 +156,425 @@ class TestFileStorage(unittest.TestCase):
             instance = value()
             instance_key = instance.__class__.__name__ + "." + instance.id
             new_dict[instance_key] = instance
-        save = FileStorage._FileStorage__objects
-        FileStorage._FileStorage__objects = new_dict
+            storage.new(instance)
         storage.save()
-        FileStorage._FileStorage__objects = save
         for key, value in new_dict.items():
             new_dict[key] = value.to_dict()
         string = json.dumps(new_dict)
-        with open("file.json", "r") as f:
+        with open(self.path, "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls_and_count_use_buckets(self):
+        """Test that all(cls) and count(cls) only see objects of cls"""
+        storage = FileStorage()
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {"State." + state.id: state})
+        self.assertIs(storage.all(State), storage.all("State"))
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.count("City"), 1)
+        self.assertEqual(storage.count(User), 0)
+        self.assertEqual(storage.count(), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_by_follows_foreign_key_updates(self):
+        """Test that all_by reflects new, attribute updates and delete"""
+        storage = FileStorage()
+        state1 = State()
+        state2 = State()
+        city = City(state_id=state1.id)
+        storage.new(city)
+        self.assertEqual(state1.cities, [city])
+        city.state_id = state2.id
+        self.assertEqual(state1.cities, [])
+        self.assertEqual(storage.all_by(City, "state_id", state2.id),
+                         {"City." + city.id: city})
+        storage.delete(city)
+        self.assertEqual(state2.cities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_save_reload_and_compact(self):
+        """Test that journal mode appends changes and replays them"""
+        storage = FileStorage()
+        log = self.path + ".log"
+        with mock.patch.object(FileStorage, "_FileStorage__journal", True):
+            state = State(name="California")
+            other = State(name="Nevada")
+            storage.new(state)
+            storage.new(other)
+            storage.save()
+            storage.delete(other)
+            with open(log) as f:
+                self.assertEqual(len(f.readlines()), 3)
+            self.assertFalse(os.path.exists(self.path))
+            self.forget()
+            storage.reload()
+            self.assertEqual(list(storage.all()), ["State." + state.id])
+            storage.compact()
+            self.assertEqual(os.path.getsize(log), 0)
+            self.forget()
+            storage.reload()
+            self.assertEqual(list(storage.all()), ["State." + state.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_keeps_unchanged_objects(self):
+        """Test that reload() keeps the objects and indexes of records that
+        did not change, and replaces those another process changed"""
+        storage = FileStorage()
+        first, second = State(name="Arizona"), State(name="Nevada")
+        storage.new(first)
+        storage.new(second)
+        with mock.patch.object(FileStorage, "_FileStorage__journal", False):
+            storage.save()
+        storage.reload()
+        list(storage.iter_all(State))
+        ids = FileStorage._FileStorage__sorted["State"]
+        places = FileStorage._FileStorage__places
+        places.build({})
+        version = storage.version(State)
+        storage.reload()
+        self.assertIs(storage.get(State, first.id), first)
+        self.assertEqual(storage.version(State), version)
+        with open(self.path) as f:
+            records = json.load(f)
+        records["State." + second.id]["name"] = "Utah"
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        storage.reload()
+        self.assertIs(storage.get(State, first.id), first)
+        self.assertEqual(storage.get(State, second.id).name, "Utah")
+        self.assertNotEqual(storage.version(State), version)
+        self.assertIs(FileStorage._FileStorage__sorted["State"], ids)
+        self.assertEqual(ids, sorted([first.id, second.id]))
+        self.assertTrue(places.built())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_snapshot_empties_journal(self):
+        """Test that a save outside journal mode empties the journal, which
+        would otherwise be replayed over the newer snapshot"""
+        storage = FileStorage()
+        state = State(name="v1")
+        storage.new(state)
+        with mock.patch.object(FileStorage, "_FileStorage__journal", True):
+            storage.save()
+        state.name = "v2"
+        with mock.patch.object(FileStorage, "_FileStorage__journal", False):
+            storage.save()
+        self.assertEqual(os.path.getsize(self.path + ".log"), 0)
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "v2")
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"], "v2")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_only_serializes_dirty_objects(self):
+        """Test that save reuses the dictionaries of unchanged objects"""
+        storage = FileStorage()
+        state = State(name="California")
+        city = City(name="Fremont")
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        self.assertEqual(FileStorage._FileStorage__dirty, {})
+        city.name = "San Jose"
+        self.assertEqual(FileStorage._FileStorage__dirty,
+                         {"City." + city.id: city})
+        with mock.patch.object(State, "to_dict") as state_to_dict:
+            storage.save()
+            self.assertFalse(state_to_dict.called)
+        with open(self.path, "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["City." + city.id]["name"], "San Jose")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload_hydrates_on_lookup(self):
+        """Test that lazy mode only builds objects when they are looked up"""
+        storage = FileStorage()
+        state = State(name="California")
+        amenity = Amenity(name="Wifi")
+        with open(self.path, "w") as f:
+            json.dump({"State." + state.id: state.to_dict(),
+                       "Amenity." + amenity.id: amenity.to_dict()}, f)
+        with mock.patch.object(FileStorage, "_FileStorage__lazy", True):
+            storage.reload()
+            self.assertEqual(storage._FileStorage__objects, {})
+            self.assertEqual(storage.count(), 2)
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(storage.get(State, state.id).name, "California")
+            self.assertEqual(list(storage._FileStorage__objects),
+                             ["State." + state.id])
+            storage.save()
+            with open(self.path, "r") as f:
+                self.assertEqual(len(json.load(f)), 2)
+            self.assertEqual(len(storage.all()), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_reload(self):
+        """Test that compact mode keeps records encoded until they are looked
+        up, as objects that print and serialize like regular ones"""
+        storage = FileStorage()
+        place = Place(name="Caf\u00e9", number_rooms=2)
+        place.extra = "value"
+        with open(self.path, "w") as f:
+            json.dump({"Place." + place.id: place.to_dict()}, f)
+        with mock.patch.object(FileStorage, "_FileStorage__compact", True):
+            storage.reload()
+            records = storage._FileStorage__raw["Place"]
+            self.assertIsInstance(records, RecordStore)
+            self.assertEqual(list(records), ["Place." + place.id])
+            self.assertEqual(storage.count(Place), 1)
+            loaded = storage.get(Place, place.id)
+        self.assertEqual(len(records), 0)
+        self.assertEqual(str(loaded), str(place))
+        self.assertEqual(list(loaded.to_dict().items()),
+                         list(place.to_dict().items()))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get(self):
+        """Test that get finds objects by class or class name"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIs(storage.get("State", state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_existing_ids(self):
+        """Test that existing_ids finds objects and raw records alike"""
+        storage = FileStorage()
+        state = State(name="California")
+        other = State(name="Nevada")
+        storage.new(state)
+        with open(self.path, "w") as f:
+            json.dump({"State." + other.id: other.to_dict()}, f)
+        with mock.patch.object(FileStorage, "_FileStorage__lazy", True):
+            storage.reload()
+        self.assertEqual(storage.existing_ids(State, [state.id, other.id,
+                                                      "missing"]),
+                         {state.id, other.id})
+        self.assertEqual(storage.existing_ids(City, [state.id]), set())
+        self.assertNotIn("State." + other.id, storage._FileStorage__objects)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter_all(self):
+        """Test that iter_all pages through a class in id order"""
+        storage = FileStorage()
+        amenities = [Amenity(name=str(i)) for i in range(5)]
+        for amenity in amenities:
+            storage.new(amenity)
+        ids = sorted(storage.all(Amenity).keys())
+        ids = [key.partition(".")[2] for key in ids]
+        self.assertEqual([a.id for a in storage.iter_all(Amenity)], ids)
+        page = list(storage.iter_all("Amenity", after_id=ids[1], limit=2))
+        self.assertEqual([a.id for a in page], ids[2:4])
+        extra = Amenity(name="extra")
+        storage.new(extra)
+        self.assertIn(extra, list(storage.iter_all(Amenity)))
+        storage.delete(extra)
+        self.assertNotIn(extra, list(storage.iter_all(Amenity)))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places combines states, cities and amenities"""
+        storage = FileStorage()
+        state = State(name="California")
+        city1 = City(name="Fremont", state_id=state.id)
+        city2 = City(name="Reno", state_id="other")
+        place1 = Place(city_id=city1.id, amenity_ids=["wifi", "pool"])
+        place2 = Place(city_id=city2.id, amenity_ids=["wifi"])
+        for obj in [state, city1, city2, place1, place2]:
+            storage.new(obj)
+        self.assertTrue(inspect.isgenerator(storage.search_places()))
+        search = storage.search_places
+        self.assertEqual(list(search(states=[state.id])), [place1])
+        self.assertEqual(list(search(states=[state.id], cities=[city2.id])),
+                         sorted([place1, place2], key=lambda p: p.id))
+        self.assertEqual(list(search(cities=[city2.id], amenities=["pool"])),
+                         [])
+        place2.amenity_ids = ["wifi", "pool"]
+        self.assertEqual(list(search(cities=[city2.id], amenities=["pool"])),
+                         [place2])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places_ranges(self):
+        """Test that search_places filters and sorts on numeric attributes"""
+        self.search_places_ranges(FileStorage())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_save(self):
+        """Test that bulk_save writes the JSON file once for all objects"""
+        storage = FileStorage()
+        states = [State(name="State{}".format(i)) for i in range(5)]
+        before = states[0].updated_at
+        with mock.patch.object(FileStorage,
+                               "_FileStorage__write_snapshot") as write:
+            self.assertEqual(storage.bulk_save(iter(states)), states)
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(storage.count(State), 5)
+        self.assertGreaterEqual(states[0].updated_at, before)
+        city = City(name="Fremont", state_id=states[0].id)
+        storage.bulk_new([city])
+        self.assertEqual(states[0].cities, [city])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_nearby_places(self):
+        """Test that nearby_places orders places by distance"""
+        storage = FileStorage()
+        sf = Place(city_id="c", latitude=37.77, longitude=-122.42)
+        oak = Place(city_id="c", latitude=37.80, longitude=-122.27)
+        la = Place(city_id="d", latitude=34.05, longitude=-118.24)
+        for place in [la, oak, sf]:
+            storage.new(place)
+        self.assertEqual(storage.nearby_places(37.7, -122.4, limit=2),
+                         [sf, oak])
+        self.assertEqual(storage.nearby_places(37.7, -122.4, radius=50),
+                         [sf, oak])
+        self.assertEqual(storage.nearby_places(37.7, -122.4, limit=1,
+                                               cities=["d"]), [la])
+        sf.latitude = 34.0
+        self.assertEqual(storage.nearby_places(34.0, -122.42, radius=1),
+                         [sf])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_text(self):
+        """Test that search_text follows new, changed and deleted objects"""
+        storage = FileStorage()
+        place = Place(name="Loft", description="zanzibar waterfront")
+        review = Review(text="zanzibar sunsets, waterfront")
+        storage.new(place)
+        storage.new(review)
+        self.assertEqual(storage.search_text("zanzibar waterfront"),
+                         [place, review])
+        self.assertEqual(storage.search_text("zanzibar",
+                                             classes=["Review"]), [review])
+        place.description = "city center"
+        self.assertEqual(storage.search_text("zanzibar"), [review])
+        storage.delete(review)
+        self.assertEqual(storage.search_text("zanzibar"), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_listen(self):
+        """Test that listeners get the keys of changed objects"""
+        storage = FileStorage()
+        keys = []
+        with mock.patch.object(FileStorage, "_FileStorage__listeners", []):
+            storage.listen(keys.append)
+            state = State(name="California")
+            storage.new(state)
+            state.name = "Nevada"
+            BaseModel().name = "not stored"
+            storage.delete(state)
+        self.assertEqual(keys, ["State." + state.id] * 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version(self):
+        """Test that the version of a class changes with its objects"""
+        storage = FileStorage()
+        state = State(name="California")
+        versions = [storage.version(State)]
+        city_version = storage.version("City")
+        storage.new(state)
+        versions.append(storage.version("State"))
+        state.name = "Nevada"
+        versions.append(storage.version(State))
+        storage.delete(state)
+        versions.append(storage.version(State))
+        self.assertEqual(len(set(versions)), 4)
+        self.assertEqual(storage.version(City), city_version)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version_other_process(self):
+        """Test that versions change and the listeners are told when another
+        process writes the file"""
+        storage = FileStorage()
+        storage.new(State(name="California"))
+        storage.save()
+        storage.reload()
+        version = storage.version(State)
+        keys = []
+        with mock.patch.object(FileStorage, "_FileStorage__listeners",
+                               [keys.append]):
+            storage.save()
+            storage.reload()
+            self.assertEqual(storage.version(State), version)
+            self.assertEqual(keys, [])
+            with open(self.path) as f:
+                records = json.load(f)
+            state = State(name="Nevada")
+            records["State." + state.id] = state.to_dict()
+            with open(self.path, "w") as f:
+                json.dump(records, f)
+            storage.reload()
+        self.assertNotEqual(storage.version(State), version)
+        self.assertEqual(keys, [None])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_text_other_process(self):
+        """Test that reload indexes the text another process wrote"""
+        storage = FileStorage()
+        place = Place(name="Wombat lodge")
+        storage.new(place)
+        storage.save()
+        storage.reload()
+        with open(self.path) as f:
+            records = json.load(f)
+        other = Place(name="Quokka lodge")
+        records["Place." + other.id] = other.to_dict()
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        storage.reload()
+        self.assertEqual([obj.id for obj in storage.search_text("lodge")],
+                         sorted([place.id, other.id]))
+        unsaved = Place(name="Quokka cabin")
+        storage.new(unsaved)
+        records["Place." + place.id]["name"] = "Quokka house"
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        text = TextIndex()
+        for key, record in records.items():
+            text.add(key, document_text("Place", record.get))
+        stat = os.stat(self.path)
+        text.write(self.path + ".idx", (stat.st_size, stat.st_mtime_ns))
+        text.clear()
+        storage.reload()
+        self.assertEqual({obj.id for obj in storage.search_text("quokka")},
+                         {place.id, other.id, unsaved.id})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts matches count for every class"""
+        storage = FileStorage()
+        storage.new(State(name="California"))
+        counts = storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name in classes:
+            self.assertEqual(counts[name], storage.count(name))
+        storage.new(State(name="Nevada"))
+        self.assertEqual(storage.counts()["State"], counts["State"] + 1)
+
+    def search_places_ranges(self, storage):
+        """searches places of an empty storage by price"""
+        places = [Place(city_id="c", price_by_night=price)
+                  for price in [80, 50, 120]]
+        for place in places:
+            storage.new(place)
+        cheap, mid, dear = places[1], places[0], places[2]
+        ranges = {"price_by_night": (None, 100)}
+        self.assertCountEqual(storage.search_places(ranges=ranges),
+                              [cheap, mid])
+        self.assertEqual(list(storage.search_places(sort="price_by_night",
+                                                    limit=2)), [cheap, mid])
+        self.assertEqual(list(storage.search_places(cities=["c"],
+                                                    sort="price_by_night",
+                                                    after_id=cheap.id,
+                                                    after_value=50)),
+                         [mid, dear])
+        dear.price_by_night = 10
+        self.assertEqual(list(storage.search_places(ranges=ranges,
+                                                    sort="price_by_night")),
+                         [dear, cheap, mid])
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Contains the TestGeoDocs and TestGeo classes
+"""
+
+import inspect
+from models.engine import geo
+import pep8
+import unittest
+
+
+class TestGeoDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the geo module"""
+    def test_pep8_conformance_geo(self):
+        """Test that models/engine/geo.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/geo.py',
+                                    'tests/test_models/test_engine/\
+test_geo.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_geo_docstrings(self):
+        """Test for the presence of docstrings in the geo module"""
+        self.assertIsNot(geo.__doc__, None)
+        for func in inspect.getmembers(geo, inspect.isfunction):
+            if func[1].__module__ == geo.__name__:
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} needs a docstring".format(func[0]))
+
+
+class TestGeo(unittest.TestCase):
+    """Test the distance and bounding box helpers"""
+    def test_distance(self):
+        """Test great-circle distances"""
+        self.assertEqual(geo.distance(10, 20, 10, 20), 0)
+        self.assertAlmostEqual(geo.distance(0, 0, 0, 180), geo.MAX_DISTANCE)
+        self.assertAlmostEqual(geo.distance(0, 0, 1, 0), 111.19, places=2)
+        self.assertAlmostEqual(geo.distance(0, 179.5, 0, -179.5),
+                               geo.distance(0, 0, 0, 1))
+
+    def test_bounding_box(self):
+        """Test that the box holds the circle"""
+        lat_min, lat_max, lngs = geo.bounding_box(0, 0, 111.19)
+        self.assertAlmostEqual(lat_min, -1, places=3)
+        self.assertAlmostEqual(lat_max, 1, places=3)
+        self.assertEqual(len(lngs), 1)
+        self.assertAlmostEqual(lngs[0][1], 1, places=3)
+        lngs = geo.bounding_box(0, 179.5, 111.19)[2]
+        self.assertEqual(len(lngs), 2)
+        self.assertEqual(lngs[0][1], 180.0)
+        self.assertEqual(lngs[1][0], -180.0)
+        self.assertAlmostEqual(lngs[1][1], -179.5, places=3)
+        self.assertEqual(geo.bounding_box(89.5, 0, 100)[2],
+                         [(-180.0, 180.0)])
+
+    def test_nearest(self):
+        """Test that the search radius grows until enough items are found"""
+        items = [(5.0, "a"), (50.0, "b"), (500.0, "c")]
+        radii = []
+
+        def within(radius):
+            """returns the items within radius"""
+            radii.append(radius)
+            return [pair for pair in items if pair[0] <= radius]
+        self.assertEqual(geo.nearest(within, limit=1), [(5.0, "a")])
+        self.assertEqual(radii, [geo.START_RADIUS])
+        self.assertEqual(geo.nearest(within, limit=2),
+                         [(5.0, "a"), (50.0, "b")])
+        self.assertEqual(geo.nearest(within, radius=100), items[:2])
+        self.assertEqual(geo.nearest(within, radius=100, limit=5), items[:2])
+        self.assertEqual(geo.nearest(within, limit=5), items)
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceIndexDocs and TestPlaceIndex classes
+"""
+
+import inspect
+import models
+from models.engine import place_index
+from models.place import Place
+import pep8
+import unittest
+PlaceIndex = place_index.PlaceIndex
+
+
+class TestPlaceIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceIndex class"""
+    def test_pep8_conformance_place_index(self):
+        """Test that models/engine/place_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/place_index.py',
+                                    'tests/test_models/test_engine/\
+test_place_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_place_index_docstrings(self):
+        """Test for the presence of docstrings in PlaceIndex"""
+        self.assertIsNot(place_index.__doc__, None)
+        self.assertIsNot(PlaceIndex.__doc__, None)
+        for func in inspect.getmembers(PlaceIndex, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlaceIndex(unittest.TestCase):
+    """Test the PlaceIndex class"""
+    def test_with_amenities(self):
+        """Test that places are matched when they have every amenity"""
+        index = PlaceIndex()
+        index.add("Place.1", Place(id="1", amenity_ids=["a", "b"]))
+        index.add("Place.2", Place(id="2", amenity_ids=["a"]))
+        self.assertEqual(index.with_amenities(["a"]), {"Place.1", "Place.2"})
+        self.assertEqual(index.with_amenities(["a", "b"]), {"Place.1"})
+        self.assertEqual(index.with_amenities(["a"], {"Place.2"}),
+                         {"Place.2"})
+        self.assertEqual(index.with_amenities(["c"]), set())
+
+    def test_add_replaces_and_remove(self):
+        """Test that re-adding a place drops its old amenities"""
+        index = PlaceIndex()
+        index.add("Place.1", Place(id="1", amenity_ids=["a"]))
+        index.add("Place.1", Place(id="1", amenity_ids=["b"]))
+        self.assertEqual(index.with_amenities(["a"]), set())
+        self.assertEqual(index.with_amenities(["b"]), {"Place.1"})
+        index.remove("Place.1")
+        self.assertEqual(index.with_amenities(["b"]), set())
+
+    def test_in_ranges(self):
+        """Test that the sorted indexes filter and order places"""
+        index = PlaceIndex()
+        index.add("Place.1", Place(id="1", price_by_night=80, max_guest=2))
+        index.build({"Place.1": Place(id="1", price_by_night=80,
+                                      max_guest=2)})
+        index.add("Place.2", Place(id="2", price_by_night=50, max_guest=4))
+        index.add("Place.3", Place(id="3", price_by_night=120, max_guest=4))
+        self.assertTrue(index.built())
+        ranges = {"price_by_night": (50, 100)}
+        self.assertEqual(index.in_ranges(ranges), {"Place.1", "Place.2"})
+        self.assertEqual(index.in_ranges({"max_guest": (3, None)}),
+                         {"Place.2", "Place.3"})
+        self.assertEqual(index.in_ranges({}, sort="price_by_night"),
+                         ["Place.2", "Place.1", "Place.3"])
+        self.assertEqual(index.in_ranges({}, sort="price_by_night",
+                                         after=(50, "Place.2"), limit=1),
+                         ["Place.1"])
+        self.assertEqual(index.in_ranges(ranges, {"Place.1"},
+                                         sort="max_guest"), ["Place.1"])
+        index.add("Place.2", Place(id="2", price_by_night=150))
+        index.remove("Place.3")
+        self.assertEqual(index.in_ranges({}, sort="price_by_night"),
+                         ["Place.1", "Place.2"])
+        self.assertEqual(index.in_ranges({"price_by_night": (80, 150)}),
+                         {"Place.1", "Place.2"})
+        self.assertEqual(index.in_ranges({"price_by_night": (81, 149)}),
+                         set())
+        index.unbuild()
+        self.assertFalse(index.built())
+        index.add("Place.4", Place(id="4", price_by_night=10))
+        index.remove("Place.1")
+        index.build({"Place.2": Place(id="2", price_by_night=150),
+                     "Place.4": Place(id="4", price_by_night=10)})
+        self.assertEqual(index.in_ranges({}, sort="price_by_night"),
+                         ["Place.4", "Place.2"])
+
+    def test_within(self):
+        """Test that the grid finds the places within a distance"""
+        index = PlaceIndex()
+        index.add("Place.1", Place(id="1", latitude=37.77,
+                                   longitude=-122.42))
+        index.add("Place.2", Place(id="2", latitude=37.80,
+                                   longitude=-122.27))
+        index.add("Place.3", Place(id="3", latitude=34.05,
+                                   longitude=-118.24))
+        index.add("Place.4", Place(id="4", latitude="x", longitude=1))
+        keys = sorted(key for d, key in index.within(37.77, -122.42, 20))
+        self.assertEqual(keys, ["Place.1", "Place.2"])
+        self.assertEqual(len(index.within(37.77, -122.42, 1000)), 3)
+        self.assertEqual([key for d, key in
+                          index.within(37.77, -122.42, 20, {"Place.2"})],
+                         ["Place.2"])
+        index.add("Place.2", Place(id="2", latitude=0, longitude=0))
+        index.remove("Place.1")
+        self.assertEqual(index.within(37.77, -122.42, 20), [])
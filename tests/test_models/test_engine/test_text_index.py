@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Contains the TestTextIndexDocs and TestTextIndex classes
+"""
+
+import inspect
+import os
+from models.engine import text_index
+import pep8
+import unittest
+TextIndex = text_index.TextIndex
+
+
+class TestTextIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of TextIndex class"""
+    def test_pep8_conformance_text_index(self):
+        """Test that models/engine/text_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/text_index.py',
+                                    'tests/test_models/test_engine/\
+test_text_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_text_index_docstrings(self):
+        """Test for the presence of docstrings in TextIndex"""
+        self.assertIsNot(text_index.__doc__, None)
+        self.assertIsNot(TextIndex.__doc__, None)
+        for func in inspect.getmembers(TextIndex, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Test the TextIndex class"""
+    path = "test_text_index.idx"
+
+    def tearDown(self):
+        """removes the index file"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def test_tokenize(self):
+        """Test that text is split in lowercase words"""
+        self.assertEqual(text_index.tokenize("Cozy loft, 2 beds!"),
+                         ["cozy", "loft", "2", "beds"])
+
+    def test_search(self):
+        """Test that documents are ranked with BM25"""
+        index = TextIndex()
+        index.add("Place.1", "cozy loft with a view")
+        index.add("Place.2", "loft loft downtown")
+        index.add("Review.1", "great view")
+        self.assertEqual([key for score, key in index.search("loft")],
+                         ["Place.2", "Place.1"])
+        self.assertEqual([key for score, key in index.search("view")],
+                         ["Review.1", "Place.1"])
+        self.assertEqual(index.search("view", classes=["Place"])[0][1],
+                         "Place.1")
+        self.assertEqual(len(index.search("loft view", limit=1)), 1)
+        self.assertEqual(index.search("nothing"), [])
+        index.add("Place.2", "quiet cabin")
+        index.remove("Review.1")
+        self.assertEqual([key for score, key in index.search("loft view")],
+                         ["Place.1"])
+        self.assertEqual(index.size(), 2)
+
+    def test_search_ties(self):
+        """Test that documents of equal score are ranked by key"""
+        index = TextIndex()
+        for key in ("Place.3", "Place.1", "Review.2", "Place.2"):
+            index.add(key, "cozy loft")
+        index.write(self.path, (1, 2))
+        index.add("Place.0", "cozy loft")
+        self.assertEqual([key for score, key in index.search("loft")],
+                         ["Place.0", "Place.1", "Place.2", "Place.3",
+                          "Review.2"])
+        self.assertEqual([key for score, key in index.search("loft",
+                                                             limit=2)],
+                         ["Place.0", "Place.1"])
+
+    def test_write_and_load(self):
+        """Test that a written index is memory-mapped with its stamp"""
+        index = TextIndex()
+        index.add("Place.1", "cozy loft")
+        index.add("Place.2", "quiet cabin")
+        expected = index.search("cozy cabin")
+        index.write(self.path, (1, 2))
+        self.assertEqual(index.search("cozy cabin"), expected)
+        loaded = TextIndex()
+        self.assertFalse(loaded.load(self.path, (1, 3)))
+        self.assertFalse(loaded.load("missing.idx", (1, 2)))
+        self.assertTrue(loaded.load(self.path, (1, 2)))
+        self.assertEqual(loaded.search("cozy cabin"), expected)
+        loaded.remove("Place.1")
+        loaded.add("Place.3", "cozy studio")
+        self.assertEqual([key for score, key in loaded.search("cozy")],
+                         ["Place.3"])
+        loaded.write(self.path, (3, 4))
+        loaded.write(self.path, (5, 6))
+        reloaded = TextIndex()
+        self.assertTrue(reloaded.load(self.path, (5, 6)))
+        self.assertEqual(reloaded.size(), 2)
+        self.assertEqual(reloaded.search("cozy cabin"),
+                         loaded.search("cozy cabin"))
+        reloaded.clear()
+        loaded.clear()
+        self.assertEqual(reloaded.size(), 0)
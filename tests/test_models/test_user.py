@@ -125,6 +125,13 @@ class TestUser(unittest.TestCase):
         self.assertEqual(new_d["created_at"], u.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], u.updated_at.strftime(t_format))
 
+    def test_to_dict_password(self):
+        """Test that only save_to_disk dictionaries keep the password"""
+        user = User(password="pwd")
+        self.assertNotIn("password", user.to_dict())
+        self.assertIn("password", user.to_dict(save_to_disk=True))
+        self.assertNotIn("password", user.to_dict())
+
     def test_str(self):
         """test that the str method has the correct output"""
         user = User()